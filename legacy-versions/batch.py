@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Vectorised MEGA TIC TAC TOE batch simulator.
+Holds N games as NumPy arrays so moves, legal-move masks and win detection
+run for the whole batch with array operations. Requires NumPy.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from original import OriginalMegaTicTacToe
+from tables import WIN_TABLE
+
+# Cell / result codes shared by all arrays
+EMPTY, X, O, DRAW = 0, 1, 2, 3
+ANY_GRID = -1  # active_grid value when any open grid may be played
+
+SYMBOLS = {EMPTY: None, X: 'X', O: 'O', DRAW: 'Draw'}
+
+_BITS = (1 << np.arange(9)).astype(np.int32)  # Weight of each position in a 9-bit mask
+_WINS = np.frombuffer(WIN_TABLE, dtype=np.uint8).astype(bool)
+
+
+def line_outcome(owner, player_codes):
+    """
+    Resolve a batch of 3x3 patterns with the 512-entry win table.
+
+    Args:
+        owner (np.ndarray): (N, 9) codes of each cell (EMPTY, X, O, DRAW)
+        player_codes (np.ndarray): (N,) or scalar code(s) to test for lines
+
+    Returns:
+        np.ndarray: (N,) bool, True where player_codes completes a line
+    """
+    masks = (owner == np.reshape(player_codes, (-1, 1))) @ _BITS
+    return _WINS[masks]
+
+
+class BatchMegaTicTacToe:
+    """
+    N independent games stored as arrays.
+
+    Attributes:
+        cells: (N, 9, 9) int8, cells[n, grid, position] is EMPTY, X or O
+        grid_winners: (N, 9) int8, EMPTY for open grids, else X, O or DRAW
+        active_grid: (N,) int8, grid to play in or ANY_GRID
+        first_move: (N,) bool
+        current_player: (N,) int8, X or O
+        winner: (N,) int8, EMPTY while the game runs, else X, O or DRAW
+    """
+
+    def __init__(self, size):
+        """
+        Create a batch of new games.
+
+        Args:
+            size (int): Number of games N
+        """
+        self.size = size
+        self.cells = np.zeros((size, 9, 9), dtype=np.int8)
+        self.grid_winners = np.zeros((size, 9), dtype=np.int8)
+        self.active_grid = np.full(size, ANY_GRID, dtype=np.int8)
+        self.first_move = np.ones(size, dtype=bool)
+        self.current_player = np.full(size, X, dtype=np.int8)
+        self.winner = np.zeros(size, dtype=np.int8)
+
+    @property
+    def game_over(self):
+        """(N,) bool, True for finished games."""
+        return self.winner != EMPTY
+
+    def reset(self, indices=None):
+        """
+        Reset some or all games to the initial state.
+
+        Args:
+            indices (np.ndarray): Games to reset; all games when None
+        """
+        if indices is None:
+            indices = slice(None)
+        self.cells[indices] = EMPTY
+        self.grid_winners[indices] = EMPTY
+        self.active_grid[indices] = ANY_GRID
+        self.first_move[indices] = True
+        self.current_player[indices] = X
+        self.winner[indices] = EMPTY
+
+    def legal_moves_mask(self):
+        """
+        Compute every game's legal moves at once.
+
+        Finished games have no legal moves.
+
+        Returns:
+            np.ndarray: (N, 81) bool, column grid * 9 + position
+        """
+        open_grids = self.grid_winners == EMPTY
+        forced = self.active_grid != ANY_GRID
+        allowed = open_grids.copy()
+        allowed[forced] &= np.arange(9) == self.active_grid[forced, None]
+        allowed &= ~self.game_over[:, None]
+        return ((self.cells == EMPTY) & allowed[:, :, None]).reshape(self.size, 81)
+
+    def step(self, actions):
+        """
+        Play one move in every running game.
+
+        Mirrors MegaTicTacToe.make_move followed by check_winner and
+        switch_player. Actions for finished games are ignored.
+
+        Args:
+            actions (np.ndarray): (N,) squares as grid * 9 + position
+
+        Returns:
+            np.ndarray: (N,) winner codes after the move (EMPTY while running)
+
+        Raises:
+            ValueError: If a running game is given an illegal move
+        """
+        actions = np.asarray(actions)
+        games = np.flatnonzero(~self.game_over)
+        squares = actions[games]
+        if not self.legal_moves_mask()[games, squares].all():
+            raise ValueError("illegal move for a running game")
+
+        grids, positions = np.divmod(squares, 9)
+        players = self.current_player[games]
+        self.cells[games, grids, positions] = players
+
+        # Resolve the grid that was played in
+        played = self.cells[games, grids]
+        won = line_outcome(played, players)
+        full = (played != EMPTY).all(axis=1)
+        self.grid_winners[games, grids] = np.where(won, players, np.where(full, DRAW, EMPTY))
+
+        # Next active grid follows the position played unless that grid is decided
+        self.active_grid[games] = np.where(self.grid_winners[games, positions] != EMPTY,
+                                           ANY_GRID, positions)
+        self.first_move[games] = False
+
+        # Resolve the mega board
+        board = self.grid_winners[games]
+        result = np.where(line_outcome(board, X), X,
+                          np.where(line_outcome(board, O), O,
+                                   np.where((board != EMPTY).all(axis=1), DRAW, EMPTY)))
+        self.winner[games] = result
+        running = games[result == EMPTY]
+        self.current_player[running] = X + O - self.current_player[running]
+        return self.winner.copy()
+
+    def random_actions(self, rng):
+        """
+        Pick a uniformly random legal move for every running game.
+
+        Args:
+            rng (np.random.Generator): Source of randomness
+
+        Returns:
+            np.ndarray: (N,) squares, -1 for finished games
+        """
+        mask = self.legal_moves_mask()
+        scores = np.where(mask, rng.random(mask.shape), -1.0)
+        return np.where(mask.any(axis=1), scores.argmax(axis=1), -1)
+
+
+def cross_validate(games=200, seed=1234):
+    """
+    Play random games in a batch and on OriginalMegaTicTacToe objects side by side.
+
+    The original class scans its lines directly, so it checks the batch
+    independently of tables.WIN_TABLE. Every step compares cells, grid
+    winners, active grid, current player, legal moves and winner, raising
+    AssertionError on the first mismatch.
+
+    Args:
+        games (int): Number of games in the batch
+        seed (int): Random seed
+
+    Returns:
+        int: Number of moves cross-checked
+    """
+    rng = np.random.default_rng(seed)
+    batch = BatchMegaTicTacToe(games)
+    singles = [OriginalMegaTicTacToe() for _ in range(games)]
+    checked = 0
+
+    while not batch.game_over.all():
+        actions = batch.random_actions(rng)
+        batch.step(actions)
+        for n, game in enumerate(singles):
+            if game.game_over:
+                continue
+            grid_num, position = divmod(int(actions[n]), 9)
+            assert game.make_move(grid_num, position), f"game {n}: batch move rejected"
+            result = game.check_winner()
+            if result:
+                game.game_over = True
+                game.winner = result
+            else:
+                game.switch_player()
+            checked += 1
+
+            cells = [[SYMBOLS[code] or ' ' for code in grid] for grid in batch.cells[n]]
+            assert cells == game.grids, f"game {n}: cells differ"
+            assert [SYMBOLS[code] for code in batch.grid_winners[n]] == game.grid_winners, \
+                f"game {n}: grid winners differ"
+            active = int(batch.active_grid[n])
+            assert (None if active == ANY_GRID else active) == game.active_grid, \
+                f"game {n}: active grid differs"
+            assert SYMBOLS[batch.winner[n]] == game.winner, f"game {n}: winner differs"
+            assert SYMBOLS[batch.current_player[n]] == game.current_player, \
+                f"game {n}: current player differs"
+            if not game.game_over:
+                legal = [divmod(int(square), 9) for square in np.flatnonzero(batch.legal_moves_mask()[n])]
+                expected = [(g, p) for g in range(9) for p in range(9) if game.is_valid_move(g, p)]
+                assert legal == expected, f"game {n}: legal moves differ"
+    return checked
+
+
+def bench(games, seed):
+    """
+    Report batch throughput for random games.
+
+    Args:
+        games (int): Batch size
+        seed (int): Random seed
+    """
+    rng = np.random.default_rng(seed)
+    batch = BatchMegaTicTacToe(games)
+    moves = 0
+    start = time.perf_counter()
+    while not batch.game_over.all():
+        moves += int((~batch.game_over).sum())
+        batch.step(batch.random_actions(rng))
+    elapsed = time.perf_counter() - start
+    print(f"📦 {games} random games in one batch (seed {seed})")
+    print(f"   {moves / elapsed:>12,.0f} moves/sec  {games / elapsed:,.0f} games/sec")
+
+
+def main():
+    """Cross-validate the batch simulator and benchmark it."""
+    parser = argparse.ArgumentParser(description="MEGA TIC TAC TOE batch simulator")
+    parser.add_argument('--games', type=int, default=10000, help='batch size for the benchmark')
+    parser.add_argument('--seed', type=int, default=1234, help='random seed')
+    parser.add_argument('--check', type=int, default=200, metavar='GAMES',
+                        help='games to cross-validate against the original rules (0 to skip)')
+    args = parser.parse_args()
+
+    if args.check:
+        checked = cross_validate(args.check, args.seed)
+        print(f"✅ {checked} moves match make_move/check_winner")
+    bench(args.games, args.seed)
+
+
+if __name__ == "__main__":
+    main()
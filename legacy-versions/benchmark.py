@@ -0,0 +1,558 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for MEGA TIC TAC TOE game states.
+Replays fixed-seed scenarios (random games, long free-choice games where
+active_grid is mostly None, and worst-case nearly full boards) on every game
+state class and reports moves per second, per-function time and bytes per
+instance. Results can be saved to JSON and compared against an earlier run.
+
+Every timed measurement runs between two passes of a fixed pure-Python
+calibration loop, and --compare gates the rates expressed per calibration
+loop (median over rounds), so a slower or busier machine cancels out while
+a slowdown in any class, shared or not, still shows.
+"""
+
+import argparse
+import copy
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import timeit
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from rules import MegaTicTacToe
+from bitboard import BitboardMegaTicTacToe
+from compact import CompactMegaTicTacToe
+from engine import best_move
+from original import OriginalMegaTicTacToe
+from profiling import deep_sizeof, profile_rules
+from zobrist import TranspositionTable
+
+# Game state classes compared by the suite; the first one is the baseline,
+# the string-scanning rules as they were before any optimisation
+STATE_CLASSES = (('original', OriginalMegaTicTacToe), ('list', MegaTicTacToe),
+                 ('bitboard', BitboardMegaTicTacToe), ('compact', CompactMegaTicTacToe))
+
+# Metric suffixes that can fail --compare: calibrated rates must not drop and
+# sizes must not grow. Raw rates and times (and the wrapper-heavy profile.*
+# means) are only reported.
+GATED_SUFFIXES = ('_per_loop', '_bytes')
+
+# Calibration passes on each side of a timed call; the fastest one counts
+CALIBRATION_PASSES = 3
+
+# Options saved with --json that must match for --compare to mean anything
+RUN_OPTIONS = ('games', 'seed', 'rounds')
+
+# A drawn-looking 3x3 pattern with the last square open and no line for anyone
+NEARLY_FULL_GRID = ['X', 'O', 'X', 'X', 'O', 'O', 'O', 'X', ' ']
+
+
+def random_game_moves(rng):
+    """
+    Play one random game with the original class and record its moves.
+
+    Args:
+        rng (random.Random): Source of randomness
+
+    Returns:
+        list: (grid_num, position) tuples in the order they were played
+    """
+    game = OriginalMegaTicTacToe()
+    moves = []
+    while True:
+        valid = [(g, p) for g in range(9) for p in range(9) if game.is_valid_move(g, p)]
+        if not valid:
+            break
+        grid_num, position = rng.choice(valid)
+        game.make_move(grid_num, position)
+        moves.append((grid_num, position))
+        if game.check_winner():
+            break
+        game.switch_player()
+    return moves
+
+
+def free_choice_game_moves(rng):
+    """
+    Play one random game that keeps sending players to decided grids.
+
+    Moves whose target grid is already won or drawn are preferred, so most
+    positions have active_grid None and every open grid is playable.
+
+    Args:
+        rng (random.Random): Source of randomness
+
+    Returns:
+        list: (grid_num, position) tuples in the order they were played
+    """
+    game = BitboardMegaTicTacToe()
+    while not game.game_over:
+        moves = game.legal_moves()
+        decided = game.x_grids | game.o_grids | game.drawn_grids
+        free = [move for move in moves if decided >> move[1] & 1]
+        game.push_move(*rng.choice(free or moves))
+    return [record[:2] for record in game.move_stack]
+
+
+def nearly_full_board(game_class):
+    """
+    Build a worst-case position: every grid open with a single empty square.
+
+    Code that walks cells or lines does the most work here, and any grid
+    may be played.
+
+    Args:
+        game_class (type): MegaTicTacToe or a compatible class
+
+    Returns:
+        MegaTicTacToe: The position as an instance of game_class
+    """
+    layout = SimpleNamespace(grids=[NEARLY_FULL_GRID] * 9, grid_winners=[None] * 9,
+                             current_player='X', game_over=False, winner=None,
+                             active_grid=None, first_move=False)
+    if hasattr(game_class, 'from_game'):
+        return game_class.from_game(layout)
+    # The original class has no from_game; its state is the plain lists
+    game = game_class()
+    game.grids = [list(grid) for grid in layout.grids]
+    game.first_move = False
+    return game
+
+
+def calibration_seconds():
+    """
+    Time one pass of a fixed pure-Python workload.
+
+    The loop exercises the same kind of interpreter work as the rules (list
+    indexing, small-int arithmetic), so its speed tracks the machine's.
+
+    Returns:
+        float: Elapsed seconds
+    """
+    start = time.perf_counter()
+    cells = [0] * 81
+    total = 0
+    for index in range(20000):
+        square = index % 81
+        cells[square] = (cells[square] + index) & 0x1FF
+        total += cells[(square * 7) % 81] >> 2
+    return time.perf_counter() - start
+
+
+def calibrated(function):
+    """
+    Time a call between two sets of calibration passes.
+
+    Each side keeps its fastest of CALIBRATION_PASSES passes, so a single
+    interrupted pass does not skew the speed.
+
+    Args:
+        function (callable): The work to time, called with no arguments
+
+    Returns:
+        tuple: (result, elapsed seconds, calibration loops per second
+            around the call)
+    """
+    before = min(calibration_seconds() for _ in range(CALIBRATION_PASSES))
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    after = min(calibration_seconds() for _ in range(CALIBRATION_PASSES))
+    return result, elapsed, 2 / (before + after)
+
+
+@contextmanager
+def gc_paused():
+    """
+    Switch off the cyclic garbage collector for a timed section, like timeit does.
+
+    Collections land at different points from run to run and would otherwise
+    show up as noise in allocation-heavy sections such as deepcopy.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def record_rate(metrics, name, rounds):
+    """
+    Store a rate measured over several rounds, raw and calibrated.
+
+    `<name>_per_sec` is the fastest round (reported); `<name>_per_loop` is
+    the median over rounds of the rate divided by the calibration speed
+    measured around it (gated by --compare).
+
+    Args:
+        metrics (dict): Metrics to add to
+        name (str): Metric name prefix, e.g. 'replay.random.list.moves'
+        rounds (list): (items per second, calibration loops/sec) per round
+
+    Returns:
+        float: The fastest raw rate, items per second
+    """
+    rate = max(rate for rate, _ in rounds)
+    metrics[f'{name}_per_sec'] = rate
+    metrics[f'{name}_per_loop'] = statistics.median(rate / speed for rate, speed in rounds)
+    return rate
+
+
+def replay(game_class, games):
+    """
+    Replay recorded games on a fresh instance of game_class per game.
+
+    Args:
+        game_class (type): MegaTicTacToe or a compatible class
+        games (list): Move lists from random_game_moves
+
+    Returns:
+        tuple: (total moves played, elapsed seconds, list of results)
+    """
+    total = 0
+    results = []
+    start = time.perf_counter()
+    for moves in games:
+        game = game_class()
+        result = None
+        for grid_num, position in moves:
+            game.make_move(grid_num, position)
+            result = game.check_winner()
+            if result:
+                break
+            game.switch_player()
+        total += len(moves)
+        results.append(result)
+    return total, time.perf_counter() - start, results
+
+
+def function_times(positions, rounds=3):
+    """
+    Time each rules function on one position per class, round by round.
+
+    Each call is repeated long enough (timeit's autorange, about 0.2 s) for
+    timer resolution not to matter, and runs between calibration passes.
+
+    Args:
+        positions (dict): Class name -> position to time on (left unchanged)
+        rounds (int): Timing rounds per function
+
+    Returns:
+        dict: Class name -> {function name: [(microseconds per call,
+            calibration loops/sec), ...] one pair per round}
+    """
+    timers = {}
+    for name, game in positions.items():
+        squares = [(g, p) for g in range(9) for p in range(9)]
+        legal = [(g, p) for g, p in squares if game.is_valid_move(g, p)]
+        functions = {
+            'is_valid_move': (lambda game=game: [game.is_valid_move(g, p) for g, p in squares],
+                              len(squares)),
+            'check_grid_winner': (lambda game=game: [game.check_grid_winner(g) for g in range(9)], 9),
+            'check_winner': (game.check_winner, 1),
+        }
+        if hasattr(game, 'push_move'):
+            # The original class cannot undo moves
+            functions['push_pop'] = (lambda game=game: [game.push_move(*move) and game.pop_move()
+                                                        for move in legal], len(legal))
+        for method, (function, calls) in functions.items():
+            timer = timeit.Timer(function)
+            number, _ = timer.autorange()
+            timers[name, method] = (timer, number, calls)
+
+    times = {name: {} for name in positions}
+    for _ in range(rounds):
+        for (name, method), (timer, number, calls) in timers.items():
+            _, elapsed, speed = calibrated(lambda: timer.timeit(number=number))
+            times[name].setdefault(method, []).append((elapsed / (number * calls) * 1e6, speed))
+    return times
+
+
+def legal_move_rate(games):
+    """
+    Compare legal move generation: walking is_valid_move vs the bitboard mask.
+
+    Args:
+        games (list): Move lists from random_game_moves
+
+    Returns:
+        tuple: ((walk positions/sec, calibration loops/sec),
+            (mask positions/sec, calibration loops/sec))
+    """
+    positions = []
+    for moves in games:
+        game = BitboardMegaTicTacToe()
+        for grid_num, position in moves:
+            positions.append(BitboardMegaTicTacToe.from_game(game))
+            game.make_move(grid_num, position)
+            game.switch_player()
+
+    walked, walk_elapsed, walk_speed = calibrated(
+        lambda: [[(g, p) for g in range(9) for p in range(9) if state.is_valid_move(g, p)]
+                 for state in positions])
+    masked, mask_elapsed, mask_speed = calibrated(
+        lambda: [state.legal_moves() for state in positions])
+
+    if walked != masked:
+        raise SystemExit("❌ legal_moves() differs from walking is_valid_move")
+    return ((len(positions) / walk_elapsed, walk_speed),
+            (len(positions) / mask_elapsed, mask_speed))
+
+
+def explore_rate(games):
+    """
+    Compare trying every child of a position: deepcopy vs push_move/pop_move.
+
+    Args:
+        games (list): Move lists from random_game_moves
+
+    Returns:
+        tuple: ((deepcopy children/sec, calibration loops/sec),
+            (push/pop children/sec, calibration loops/sec))
+    """
+    positions = []
+    for moves in games:
+        game = BitboardMegaTicTacToe()
+        for grid_num, position in moves:
+            positions.append(BitboardMegaTicTacToe.from_game(game))
+            game.push_move(grid_num, position)
+
+    def by_copy():
+        children = 0
+        for state in positions:
+            for grid_num, position in state.legal_moves():
+                child = copy.deepcopy(state)
+                child.make_move(grid_num, position)
+                child.check_winner()
+                child.switch_player()
+                children += 1
+        return children
+
+    def by_push_pop():
+        for state in positions:
+            for grid_num, position in state.legal_moves():
+                state.push_move(grid_num, position)
+                state.pop_move()
+
+    children, copy_elapsed, copy_speed = calibrated(by_copy)
+    _, push_elapsed, push_speed = calibrated(by_push_pop)
+    return ((children / copy_elapsed, copy_speed),
+            (children / push_elapsed, push_speed))
+
+
+def table_stats(table_mb, moves=20, time_ms=50):
+    """
+    Play the opening of a bot-vs-bot game with a given transposition table size.
+
+    Args:
+        table_mb (float): Table memory cap in megabytes
+        moves (int): Number of moves to play
+        time_ms (float): Search time per move
+
+    Returns:
+        dict: TranspositionTable.stats() after the game
+    """
+    table = TranspositionTable(int(table_mb * 1024 * 1024))
+    game = BitboardMegaTicTacToe()
+    for _ in range(moves):
+        if game.game_over:
+            break
+        game.push_move(*best_move(game, time_ms, table=table))
+    return table.stats()
+
+
+def run_suite(args):
+    """
+    Run every benchmark section, printing results as it goes.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line options
+
+    Returns:
+        dict: Flat metric name -> value
+    """
+    metrics = {}
+    rng = random.Random(args.seed)
+    scenarios = {
+        'random': [random_game_moves(rng) for _ in range(args.games)],
+        'free_choice': [free_choice_game_moves(rng) for _ in range(max(args.games // 4, 1))],
+    }
+
+    for scenario, games in scenarios.items():
+        print(f"🎮 Replaying {len(games)} {scenario} games (seed {args.seed})")
+        # Interleaved rounds; each replay is calibrated on its own
+        rates = {name: [] for name, _ in STATE_CLASSES}
+        reference_results = None
+        for _ in range(args.rounds):
+            for name, game_class in STATE_CLASSES:
+                with gc_paused():
+                    (total, _, results), seconds, speed = calibrated(
+                        lambda: replay(game_class, games))
+                rates[name].append((total / seconds, speed))
+                if reference_results is None:
+                    reference_results = results
+                elif results != reference_results:
+                    raise SystemExit(f"❌ {name} results differ from the original game")
+        baseline = None
+        for name, _ in STATE_CLASSES:
+            rate = record_rate(metrics, f'replay.{scenario}.{name}.moves', rates[name])
+            baseline = baseline or rate
+            print(f"   {name:<10} {rate:>12,.0f} moves/sec  ({rate / baseline:.2f}x)")
+
+    print("🔬 Time per rules call while replaying random games (wrapper included, not gated)")
+    for name, game_class in STATE_CLASSES:
+        with profile_rules(game_class) as profiler:
+            replay(game_class, scenarios['random'][:200])
+        print(f"   {name}")
+        print(profiler.report())
+        for method, stat in profiler.stats().items():
+            metrics[f'profile.{name}.{method}.mean_us'] = stat['mean_us']
+
+    print("🧱 Worst case: nearly full board, any grid playable (us per call)")
+    times = function_times({name: nearly_full_board(game_class)
+                            for name, game_class in STATE_CLASSES}, args.rounds)
+    for name, _ in STATE_CLASSES:
+        print(f"   {name:<10} " + "  ".join(f"{method} {min(us for us, _ in rounds):.2f}"
+                                           for method, rounds in times[name].items()))
+        for method, rounds in times[name].items():
+            metrics[f'worst_case.{name}.{method}_us'] = min(us for us, _ in rounds)
+            record_rate(metrics, f'worst_case.{name}.{method}.calls',
+                        [(1e6 / us, speed) for us, speed in rounds])
+
+    print("💾 Bytes per instance (undo history included where the class keeps one)")
+    sample = scenarios['random'][0]
+    for name, game_class in STATE_CLASSES:
+        played = game_class()
+        for grid_num, position in sample:
+            if hasattr(played, 'push_move'):
+                played.push_move(grid_num, position)
+            else:
+                played.make_move(grid_num, position)
+                if not played.check_winner():
+                    played.switch_player()
+        new_bytes = deep_sizeof(game_class())
+        end_bytes = deep_sizeof(played)
+        metrics[f'memory.{name}.new_bytes'] = new_bytes
+        metrics[f'memory.{name}.finished_bytes'] = end_bytes
+        print(f"   {name:<10} new game {new_bytes:>7,} bytes  "
+              f"after {len(sample)} moves {end_bytes:>7,} bytes")
+
+    with gc_paused():
+        walk_rates, mask_rates = zip(*(legal_move_rate(scenarios['random'][:200])
+                                       for _ in range(args.rounds)))
+    walk_rate = record_rate(metrics, 'legal_moves.walk.positions', walk_rates)
+    mask_rate = record_rate(metrics, 'legal_moves.mask.positions', mask_rates)
+    print("🎯 Legal move generation")
+    print(f"   {'walk':<10} {walk_rate:>12,.0f} positions/sec  (1.00x)")
+    print(f"   {'mask':<10} {mask_rate:>12,.0f} positions/sec  ({mask_rate / walk_rate:.2f}x)")
+
+    with gc_paused():
+        copy_rates, push_rates = zip(*(explore_rate(scenarios['random'][:100])
+                                       for _ in range(args.rounds)))
+    copy_rate = record_rate(metrics, 'explore.deepcopy.children', copy_rates)
+    push_rate = record_rate(metrics, 'explore.push_pop.children', push_rates)
+    print("🔄 Child exploration")
+    print(f"   {'deepcopy':<10} {copy_rate:>12,.0f} children/sec  (1.00x)")
+    print(f"   {'push/pop':<10} {push_rate:>12,.0f} children/sec  ({push_rate / copy_rate:.2f}x)")
+
+    if args.table_mb:
+        print("🧠 Transposition table (20 bot moves, 50 ms each)")
+    for table_mb in args.table_mb:
+        stats = table_stats(table_mb)
+        metrics[f'table.{table_mb:g}mb.hit_rate'] = stats['hit_rate']
+        print(f"   {table_mb:>6g} MB  hit rate {stats['hit_rate']:.1%}  "
+              f"fill {stats['fill']:.1%}  overwrites {stats['overwrites']:,}  "
+              f"memory {stats['memory_bytes']:,} bytes")
+    return metrics
+
+
+def compare(metrics, baseline, tolerance):
+    """
+    Print how each metric moved against a saved run and find regressions.
+
+    Only GATED_SUFFIXES can regress: calibrated rates when they drop and
+    sizes when they grow. Raw rates and times are shown for reference only,
+    since they follow whatever else the machine is doing.
+
+    Args:
+        metrics (dict): Metrics from this run
+        baseline (dict): Metrics from the saved run
+        tolerance (float): Allowed relative change, e.g. 0.1 for 10%
+
+    Returns:
+        list: Names of the regressed metrics
+    """
+    regressions = []
+    print(f"📈 Compared with the saved run (tolerance {tolerance:.0%}, ❌ marks gated metrics)")
+    for name, value in metrics.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        change = value / old - 1
+        if not name.endswith(GATED_SUFFIXES):
+            worse = False
+        elif name.endswith('_per_loop'):
+            worse = change < -tolerance
+        else:
+            worse = change > tolerance
+        if worse:
+            regressions.append(name)
+        print(f"   {'❌' if worse else '  '} {name:<56} {change:+8.1%}")
+    if regressions:
+        print(f"❌ {len(regressions)} metric(s) regressed by more than {tolerance:.0%}")
+    else:
+        print("✅ No regressions")
+    return regressions
+
+
+def main():
+    """Run the suite, optionally saving results or comparing with a saved run."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=2000, help='number of random games')
+    parser.add_argument('--seed', type=int, default=1234, help='random seed')
+    parser.add_argument('--rounds', type=int, default=5,
+                        help='rounds per timed section (fastest rate reported, '
+                             'median calibrated rate gated)')
+    parser.add_argument('--table-mb', type=float, nargs='*', default=[0.25, 4, 16],
+                        help='transposition table sizes to compare (none to skip)')
+    parser.add_argument('--json', metavar='PATH', help='save the metrics to a JSON file')
+    parser.add_argument('--compare', metavar='PATH', help='compare with metrics saved by --json')
+    # Calibrated rates still move by up to ~15% between runs on a busy machine
+    parser.add_argument('--tolerance', type=float, default=0.20,
+                        help='relative change reported as a regression')
+    args = parser.parse_args()
+
+    saved = None
+    if args.compare:
+        with open(args.compare) as source:
+            saved = json.load(source)
+        # Different scenarios or round counts give different numbers, not regressions
+        mismatched = [f"{option} {saved.get(option)} (now {getattr(args, option)})"
+                      for option in RUN_OPTIONS if saved.get(option) != getattr(args, option)]
+        if mismatched:
+            parser.error(f"{args.compare} was saved with different settings: {', '.join(mismatched)}")
+
+    metrics = run_suite(args)
+
+    if args.json:
+        with open(args.json, 'w') as out:
+            json.dump({'python': platform.python_version(), 'platform': platform.platform(),
+                       **{option: getattr(args, option) for option in RUN_OPTIONS},
+                       'metrics': metrics},
+                      out, indent=2, sort_keys=True)
+        print(f"💾 Saved {len(metrics)} metrics to {args.json}")
+
+    if saved is not None and compare(metrics, saved['metrics'], args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
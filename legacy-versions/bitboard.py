@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Bitboard-backed MEGA TIC TAC TOE search state.
+Stores the 81 squares as one 9-bit mask per grid and player instead of
+nine lists of strings, with packed 81-bit views for hashing and symmetry,
+while keeping the MegaTicTacToe API unchanged. It is the state the engines
+search on: moves keep a per-grid blocked mask and an incremental Zobrist
+key. It is not a memory-lean state (see compact.py for that).
+"""
+
+from rules import GridMasksMixin, MegaTicTacToe
+from tables import FULL_GRID, WIN_TABLE
+from zobrist import ACTIVE_KEYS, CELL_KEYS, GRID_KEYS, SIDE_KEY, full_hash
+
+
+def grid_mask(cells, grid_num):
+    """
+    Extract the 9-bit mask of one grid from a packed 81-bit cell mask.
+
+    Args:
+        cells (int): Packed cells, grid n occupying bits 9n..9n+8
+        grid_num (int): The grid number (0-8)
+
+    Returns:
+        int: 9-bit mask of the grid's occupied positions
+    """
+    return (cells >> (grid_num * 9)) & FULL_GRID
+
+
+def pack_masks(masks):
+    """
+    Pack nine 9-bit grid masks into one 81-bit cell mask.
+
+    Args:
+        masks (list): 9-bit mask per grid
+
+    Returns:
+        int: Packed cells, grid n occupying bits 9n..9n+8
+    """
+    cells = 0
+    for grid_num, mask in enumerate(masks):
+        cells |= mask << (grid_num * 9)
+    return cells
+
+
+class BitboardMegaTicTacToe(MegaTicTacToe):
+    """
+    MegaTicTacToe with a bitboard state for search.
+
+    State layout:
+        x_masks / o_masks: one 9-bit mask per grid of the squares each
+            player has marked
+        blocked: per grid, the 9-bit mask of squares that cannot be played
+            (marked squares, or all of them once the grid is decided)
+        x_grids / o_grids / drawn_grids: 9-bit masks of grids won by each
+            player or drawn
+        zobrist_key: 64-bit Zobrist key of the position, updated
+            incrementally on every move and player switch
+
+    The `grids` and `grid_winners` attributes of the original class are
+    exposed as read-only views so display and input code keep working, and
+    x_cells / o_cells pack the marks into 81-bit ints (bit grid * 9 +
+    position) for hashing and symmetry.
+    """
+
+    def __init__(self):
+        """Initialize the game with an empty bitboard and starting player."""
+        self.reset_game()
+
+    def reset_game(self):
+        """Reset the game to initial state."""
+        self.x_masks = [0] * 9
+        self.o_masks = [0] * 9
+        self.blocked = [0] * 9
+        self.x_grids = 0
+        self.o_grids = 0
+        self.drawn_grids = 0
+        self.current_player = 'X'
+        self.game_over = False
+        self.winner = None
+        self.active_grid = None
+        self.first_move = True
+        self.move_stack = []
+        self.zobrist_key = ACTIVE_KEYS[9]
+
+    @classmethod
+    def from_game(cls, game):
+        """
+        Build a bitboard state from any MegaTicTacToe instance.
+
+        Args:
+            game (MegaTicTacToe): The game to convert
+
+        Returns:
+            BitboardMegaTicTacToe: An equivalent bitboard-backed game
+        """
+        state = super().from_game(game)
+        state.zobrist_key = full_hash(state)
+        return state
+
+    @property
+    def grids(self):
+        """List-of-strings view of the 81 squares (built on demand)."""
+        return [['X' if x_mask >> pos & 1 else 'O' if o_mask >> pos & 1 else ' '
+                 for pos in range(9)]
+                for x_mask, o_mask in zip(self.x_masks, self.o_masks)]
+
+    @property
+    def x_cells(self):
+        """X's marks packed into an 81-bit int (built on demand)."""
+        return pack_masks(self.x_masks)
+
+    @property
+    def o_cells(self):
+        """O's marks packed into an 81-bit int (built on demand)."""
+        return pack_masks(self.o_masks)
+
+    @property
+    def grid_winners(self):
+        """List view of grid results: 'X', 'O', 'Draw' or None per grid."""
+        return [self._grid_result(grid_num) for grid_num in range(9)]
+
+    def _place(self, grid_num, position, mark):
+        """Put a mark on an empty square without any rules checks."""
+        if mark == 'X':
+            self.x_masks[grid_num] |= 1 << position
+        else:
+            self.o_masks[grid_num] |= 1 << position
+        self.blocked[grid_num] |= 1 << position
+
+    def _record_grid_result(self, grid_num, result):
+        """Record a grid's result in the masks (grid_winners is a view here)."""
+        GridMasksMixin._record_grid_result(self, grid_num, result)
+        if result:
+            self.blocked[grid_num] = FULL_GRID
+
+    def set_cells(self, x_cells, o_cells):
+        """
+        Replace all marks from packed 81-bit cell masks.
+
+        Grid results are recomputed from the cells; the active grid and the
+        Zobrist key are left to the caller.
+
+        Args:
+            x_cells (int): Packed squares marked by X
+            o_cells (int): Packed squares marked by O
+        """
+        self.x_masks = [grid_mask(x_cells, grid_num) for grid_num in range(9)]
+        self.o_masks = [grid_mask(o_cells, grid_num) for grid_num in range(9)]
+        self.blocked = [x_mask | o_mask for x_mask, o_mask in zip(self.x_masks, self.o_masks)]
+        self.x_grids = self.o_grids = self.drawn_grids = 0
+        for grid_num in range(9):
+            self._record_grid_result(grid_num, self.check_grid_winner(grid_num))
+
+    def is_valid_move(self, grid_num, position):
+        """
+        Check if a move is valid in the specified grid.
+
+        Args:
+            grid_num (int): The grid number (0-8)
+            position (int): The position within the grid (0-8)
+
+        Returns:
+            bool: True if move is valid, False otherwise
+        """
+        if not (0 <= grid_num < 9 and 0 <= position < 9):
+            return False
+
+        if self.blocked[grid_num] >> position & 1:
+            return False
+
+        if not self.first_move and self.active_grid is not None and grid_num != self.active_grid:
+            return False
+
+        return True
+
+    def make_move(self, grid_num, position):
+        """
+        Make a move on the specified grid.
+
+        Args:
+            grid_num (int): The grid number (0-8)
+            position (int): The position within the grid (0-8)
+        """
+        if self.is_valid_move(grid_num, position):
+            square = grid_num * 9 + position
+            active_grid = self.active_grid
+            key = self.zobrist_key ^ ACTIVE_KEYS[9 if active_grid is None else active_grid]
+
+            # Only the mover can complete a line, since the grid was open
+            if self.current_player == 'X':
+                own = self.x_masks[grid_num] = self.x_masks[grid_num] | 1 << position
+                filled = own | self.o_masks[grid_num]
+                key ^= CELL_KEYS[0][square]
+                if WIN_TABLE[own]:
+                    self.x_grids |= 1 << grid_num
+                    key ^= GRID_KEYS[0][grid_num]
+            else:
+                own = self.o_masks[grid_num] = self.o_masks[grid_num] | 1 << position
+                filled = own | self.x_masks[grid_num]
+                key ^= CELL_KEYS[1][square]
+                if WIN_TABLE[own]:
+                    self.o_grids |= 1 << grid_num
+                    key ^= GRID_KEYS[1][grid_num]
+            if WIN_TABLE[own]:
+                self.blocked[grid_num] = FULL_GRID
+            else:
+                self.blocked[grid_num] = filled
+                if filled == FULL_GRID:
+                    self.drawn_grids |= 1 << grid_num
+                    key ^= GRID_KEYS[2][grid_num]
+
+            # Set next active grid based on position played
+            # If that grid is decided (fully blocked), player can choose any available grid
+            if self.blocked[position] == FULL_GRID:
+                active_grid = None
+                key ^= ACTIVE_KEYS[9]
+            else:
+                active_grid = position
+                key ^= ACTIVE_KEYS[position]
+            self.active_grid = active_grid
+            self.zobrist_key = key
+
+            self.first_move = False
+            return True
+        return False
+
+    def switch_player(self):
+        """Switch to the other player."""
+        self.current_player = 'O' if self.current_player == 'X' else 'X'
+        self.zobrist_key ^= SIDE_KEY
+
+    def push_move(self, grid_num, position):
+        """
+        Play a full turn: make the move, resolve the game and pass the turn.
+
+        Records only the undo delta on move_stack (O(1), no copies),
+        including the previous Zobrist key so pop_move need not rehash.
+
+        Args:
+            grid_num (int): The grid number (0-8)
+            position (int): The position within the grid (0-8)
+
+        Returns:
+            bool: True if the move was played, False if it was invalid
+        """
+        player = self.current_player
+        active_grid = self.active_grid
+        first_move = self.first_move
+        game_over = self.game_over
+        winner = self.winner
+        zobrist_key = self.zobrist_key
+        if not self.make_move(grid_num, position):
+            return False
+
+        # The grid was open, so it is decided now exactly when it is blocked
+        grid_changed = self.blocked[grid_num] == FULL_GRID
+        self.move_stack.append((grid_num, position, player, active_grid, first_move,
+                                grid_changed, game_over, winner, zobrist_key))
+
+        # The game can only end on a move that decides a grid
+        result = (grid_changed or game_over) and self.check_winner()
+        if result:
+            self.game_over = True
+            self.winner = result
+        else:
+            self.current_player = 'O' if player == 'X' else 'X'
+            self.zobrist_key ^= SIDE_KEY
+        return True
+
+    def pop_move(self):
+        """
+        Undo the last move played with push_move.
+
+        Returns:
+            tuple: The (grid_num, position) that was undone, or None if there
+                is nothing to undo
+        """
+        if not self.move_stack:
+            return None
+        (grid_num, position, player, active_grid, first_move,
+         grid_changed, game_over, winner, zobrist_key) = self.move_stack.pop()
+        if player == 'X':
+            self.x_masks[grid_num] &= ~(1 << position)
+        else:
+            self.o_masks[grid_num] &= ~(1 << position)
+        self.blocked[grid_num] = self.x_masks[grid_num] | self.o_masks[grid_num]
+        if grid_changed:
+            GridMasksMixin._reopen_grid(self, grid_num)  # grid_winners is a view here
+        self.current_player = player
+        self.active_grid = active_grid
+        self.first_move = first_move
+        self.game_over = game_over
+        self.winner = winner
+        self.zobrist_key = zobrist_key
+        return (grid_num, position)
+
+    def legal_moves_mask(self):
+        """
+        Return every legal move as one packed 81-bit mask.
+
+        Bit (grid * 9 + position) is set when is_valid_move(grid, position)
+        would return True, without walking all 81 squares.
+
+        Returns:
+            int: Packed mask of legal squares
+        """
+        blocked = self.blocked
+        if not self.first_move and self.active_grid is not None:
+            return (~blocked[self.active_grid] & FULL_GRID) << (self.active_grid * 9)
+        mask = 0
+        for grid_num in range(9):
+            mask |= (~blocked[grid_num] & FULL_GRID) << (grid_num * 9)
+        return mask
+
+
+def main():
+    """Start a console game backed by the bitboard state."""
+    from main import ConsoleGame
+
+    class ConsoleBitboardGame(ConsoleGame, BitboardMegaTicTacToe):
+        """Console game on the bitboard rules."""
+
+    try:
+        game = ConsoleBitboardGame()
+        game.play_game()
+    except KeyboardInterrupt:
+        print("\n\n👋 Game interrupted. Thanks for playing!")
+
+
+if __name__ == "__main__":
+    main()
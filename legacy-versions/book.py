@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Opening book and endgame solver for MEGA TIC TAC TOE.
+
+The opening book is generated offline by deep searches from the initial
+position and stored as a sorted file of (canonical key, best move) entries
+that is memory-mapped and binary-searched on demand. Near the end of the
+game an exact, memoised solver takes over, so production moves only fall
+back to a live search in the middlegame.
+"""
+
+import argparse
+import mmap
+import struct
+import time
+
+from bitboard import BitboardMegaTicTacToe
+from engine import DEFAULT_TIME_MS, MAX_DEPTH, Search, SearchTimeout
+from engine import best_move as search_move
+from positiondb import PositionDB
+from symmetry import INVERSE, KEY_BYTES, canonicalize, transform_move
+from tables import EXPAND_TABLE, FULL_GRID
+
+BOOK_MAGIC = b'NBK1'
+ENTRY = struct.Struct(f'>{KEY_BYTES}sB')  # (big-endian key, grid * 9 + position)
+HEADER = struct.Struct('>4sI')  # (magic, entry count)
+
+DEFAULT_BOOK_DEPTH = 3
+DEFAULT_BOOK_TIME_MS = 500
+ENDGAME_EMPTIES = 10  # Solve exactly at or below this many playable squares (worst case ~0.1s)
+SOLVER_SHARE = 0.5  # Share of a move's time budget the solver may use before search takes over
+SOLVER_MEMO_ENTRIES = 200_000  # ~20 MB of memo; cleared when full, as the default solver never goes away
+
+
+class OpeningBook:
+    """Read-only opening book, memory-mapped on first lookup."""
+
+    def __init__(self, path):
+        """
+        Remember the book file; nothing is read until the first lookup.
+
+        Args:
+            path (str): Book file written by generate_book
+        """
+        self.path = path
+        self._file = None
+        self._data = None
+        self.entries = 0
+
+    def _open(self):
+        """Map the book file and validate its header."""
+        self._file = open(self.path, 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.entries = HEADER.unpack_from(self._data, 0)
+        if magic != BOOK_MAGIC:
+            raise ValueError(f"{self.path} is not an opening book")
+
+    def close(self):
+        """Unmap the book file."""
+        if self._data is not None:
+            self._data.close()
+            self._file.close()
+            self._data = self._file = None
+
+    def lookup(self, state):
+        """
+        Find the book move for a position in any orientation.
+
+        Args:
+            state (MegaTicTacToe): The position
+
+        Returns:
+            tuple: (grid_num, position) in the state's orientation, or None
+                if the position is not in the book
+        """
+        if self._data is None:
+            self._open()
+        key, symmetry = canonicalize(state)
+        target = key.to_bytes(KEY_BYTES, 'big')
+        data = self._data
+        low, high = 0, self.entries
+        while low < high:
+            middle = (low + high) // 2
+            offset = HEADER.size + middle * ENTRY.size
+            found = data[offset:offset + KEY_BYTES]
+            if found < target:
+                low = middle + 1
+            elif found > target:
+                high = middle
+            else:
+                square = data[offset + KEY_BYTES]
+                return transform_move(divmod(square, 9), INVERSE[symmetry])
+        return None
+
+
+def write_book(path, moves):
+    """
+    Write a book file.
+
+    Args:
+        path (str): Output file
+        moves (dict): Canonical key -> (grid_num, position) in canonical orientation
+
+    Returns:
+        int: Number of entries written
+    """
+    with open(path, 'wb') as out:
+        out.write(HEADER.pack(BOOK_MAGIC, len(moves)))
+        for key in sorted(moves):
+            grid_num, position = moves[key]
+            out.write(ENTRY.pack(key.to_bytes(KEY_BYTES, 'big'), grid_num * 9 + position))
+    return len(moves)
+
+
+def generate_book(path, depth=DEFAULT_BOOK_DEPTH, time_ms=DEFAULT_BOOK_TIME_MS, db=None,
+                  progress=None, search_depth=MAX_DEPTH):
+    """
+    Search every canonical position reachable in fewer than `depth` moves.
+
+    Positions the index already holds at search_depth or deeper reuse the
+    stored move without a search. Other stored rows are searched first and
+    still win when they are at least as deep as the iteration the timed
+    search completes (see engine.Search.run).
+
+    Args:
+        path (str): Output book file
+        depth (int): Positions with fewer moves than this are booked
+        time_ms (float): Search time per position
+        db (PositionDB): Optional position index to share results with
+        progress (callable): Optional callback(positions searched, ply) per position
+        search_depth (int): Deepest search iteration per position
+
+    Returns:
+        int: Number of positions in the book
+    """
+    moves = {}
+    level = {canonicalize(BitboardMegaTicTacToe())[0]: BitboardMegaTicTacToe()}
+    for ply in range(depth):
+        next_level = {}
+        for key, state in level.items():
+            if state.game_over:
+                continue
+            search = Search(state, time_ms, db=db)
+            move = search.run(search_depth)
+            _, symmetry = canonicalize(state)
+            moves[key] = transform_move(move, symmetry)
+            if db is not None and not search.from_db:
+                db.store(state, search.best_score, move, visits=0, depth=search.depth_reached)
+            if progress:
+                progress(len(moves), ply)
+            if ply + 1 < depth:
+                for child_move in state.legal_moves():
+                    state.push_move(*child_move)
+                    child_key, _ = canonicalize(state)
+                    if child_key not in next_level:
+                        next_level[child_key] = BitboardMegaTicTacToe.from_game(state)
+                    state.pop_move()
+        level = next_level
+    if db is not None:
+        db.commit()
+    return write_book(path, moves)
+
+
+def playable_squares(state):
+    """
+    Count the empty squares left in grids that are still open.
+
+    Args:
+        state (BitboardMegaTicTacToe): The position
+
+    Returns:
+        int: Number of squares that can still be played
+    """
+    open_grids = ~(state.x_grids | state.o_grids | state.drawn_grids) & FULL_GRID
+    return (EXPAND_TABLE[open_grids] & ~(state.x_cells | state.o_cells)).bit_count()
+
+
+class EndgameSolver:
+    """Exact win/draw/loss solver with a memo shared across calls."""
+
+    def __init__(self, max_empties=ENDGAME_EMPTIES, max_entries=SOLVER_MEMO_ENTRIES):
+        """
+        Set the solver limits.
+
+        Args:
+            max_empties (int): Largest number of playable squares to solve
+            max_entries (int): Memo size before it is cleared
+        """
+        self.max_empties = max_empties
+        self.max_entries = max_entries
+        self.memo = {}
+        self.nodes = 0
+        self.deadline = None
+
+    def applies(self, state):
+        """Return True if the position is small enough to solve exactly."""
+        return not state.game_over and playable_squares(state) <= self.max_empties
+
+    def _value(self, state):
+        """Exact value for the side to move: 1 win, 0 draw, -1 loss."""
+        if state.game_over:
+            # Only the player who just moved can have won
+            return 0 if state.winner == 'Draw' else -1
+        key = state.zobrist_key
+        value = self.memo.get(key)
+        if value is not None:
+            return value
+
+        self.nodes += 1
+        if self.deadline is not None and self.nodes & 255 == 0 and time.perf_counter() >= self.deadline:
+            raise SearchTimeout()
+        value = -1
+        for move in state.legal_moves():
+            state.push_move(*move)
+            score = -self._value(state)
+            state.pop_move()
+            if score > value:
+                value = score
+                if value == 1:
+                    break
+
+        if len(self.memo) >= self.max_entries:
+            self.memo.clear()
+        self.memo[key] = value
+        return value
+
+    def solve(self, state, time_ms=None):
+        """
+        Solve a position exactly.
+
+        Only finished subtrees are memoised, so a solve that runs out of
+        time still leaves exact entries that speed up the next attempt.
+
+        Args:
+            state (MegaTicTacToe): The position (left untouched)
+            time_ms (float): Optional time limit; None to always finish
+
+        Returns:
+            tuple: (value, best move) with value 1 win, 0 draw, -1 loss for
+                the side to move; the move is None if there are no moves
+
+        Raises:
+            SearchTimeout: If time_ms runs out before the solve finishes
+        """
+        state = BitboardMegaTicTacToe.from_game(state)
+        self.deadline = None if time_ms is None else time.perf_counter() + time_ms / 1000.0
+        best_value = None
+        best = None
+        try:
+            for move in state.legal_moves():
+                state.push_move(*move)
+                score = -self._value(state)
+                state.pop_move()
+                if best_value is None or score > best_value:
+                    best_value, best = score, move
+                    if score == 1:
+                        break
+        finally:
+            self.deadline = None
+        return (0 if best_value is None else best_value), best
+
+
+_default_solver = EndgameSolver()
+
+
+def choose_move(state, time_ms=DEFAULT_TIME_MS, book=None, solver=None):
+    """
+    Production move choice: opening book, then endgame solver, then search.
+
+    The solver gets SOLVER_SHARE of time_ms; if it cannot finish in that
+    time, a search uses the rest, so the whole move stays within time_ms.
+
+    Args:
+        state (MegaTicTacToe): Any MegaTicTacToe-compatible game state
+        time_ms (float): Time budget for the move
+        book (OpeningBook): Optional opening book
+        solver (EndgameSolver): Solver to use instead of the shared one
+
+    Returns:
+        tuple: (grid_num, position), or None if there are no legal moves
+    """
+    if book is not None:
+        move = book.lookup(state)
+        if move is not None:
+            return move
+    solver = solver or _default_solver
+    bitboard = BitboardMegaTicTacToe.from_game(state)
+    if solver.applies(bitboard):
+        start = time.perf_counter()
+        try:
+            return solver.solve(bitboard, time_ms * SOLVER_SHARE)[1]
+        except SearchTimeout:
+            time_ms -= (time.perf_counter() - start) * 1000.0
+    return search_move(bitboard, time_ms)
+
+
+def main():
+    """Generate an opening book file."""
+    parser = argparse.ArgumentParser(description="MEGA TIC TAC TOE opening book generator")
+    parser.add_argument('output', help='book file to write')
+    parser.add_argument('--depth', type=int, default=DEFAULT_BOOK_DEPTH,
+                        help='book positions with fewer moves than this')
+    parser.add_argument('--time-ms', type=float, default=DEFAULT_BOOK_TIME_MS,
+                        help='search time per position')
+    parser.add_argument('--search-depth', type=int, default=MAX_DEPTH,
+                        help='deepest search per position; --db rows this deep are reused')
+    parser.add_argument('--db', help='reuse and store results in this position database')
+    args = parser.parse_args()
+
+    database = PositionDB(args.db) if args.db else None
+
+    def progress(done, ply):
+        print(f"\r📖 ply {ply}: {done} positions searched", end='', flush=True)
+
+    start = time.perf_counter()
+    count = generate_book(args.output, args.depth, args.time_ms, database, progress,
+                          args.search_depth)
+    if database is not None:
+        database.close()
+    print(f"\n💾 Wrote {count} positions to {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Memory-lean MEGA TIC TAC TOE state for hosting many games at once.
+Keeps the 81 squares in one bytearray and the move history as 3 bytes per
+move in a __slots__ class with no per-instance __dict__, while keeping the
+MegaTicTacToe API. Sessions copy and pickle cheaply between processes.
+"""
+
+import argparse
+import pickle
+import random
+import tracemalloc
+
+from rules import GridMasksMixin
+from tables import EXPAND_TABLE, outcome
+
+EMPTY, X, O = 0, 1, 2  # Cell codes in the cells bytearray
+NO_GRID = 9  # Stored in a history byte when active_grid was None
+
+_PLAYER_CODES = {'X': X, 'O': O}
+_RESULT_CODES = {None: 0, 'X': 1, 'O': 2, 'Draw': 3}
+_RESULTS = (None, 'X', 'O', 'Draw')
+_GRID_OUTCOMES = {}  # 9 cell bytes -> check_grid_winner result, filled on first use
+_EMPTY_DIGITS = bytes.maketrans(bytes((EMPTY, X, O)), b'100')  # Cell codes -> '1' if empty
+
+
+class CompactMegaTicTacToe(GridMasksMixin):
+    """
+    MegaTicTacToe with a compact, slotted state.
+
+    State layout:
+        cells: bytearray(81), cells[grid * 9 + position] is EMPTY, X or O
+        x_grids / o_grids / drawn_grids: 9-bit masks of grids won by each
+            player or drawn
+        history: bytearray with 3 bytes per pushed move (square, packed
+            flags, previous winner) used by pop_move
+
+    `grids`, `grid_winners` and `move_stack` are read-only views built on
+    demand in the same shape as the original class.
+    """
+
+    __slots__ = ('cells', 'x_grids', 'o_grids', 'drawn_grids', 'current_player',
+                 'game_over', 'winner', 'active_grid', 'first_move', 'history')
+
+    def __init__(self):
+        """Initialize the game with empty cells and starting player."""
+        self.reset_game()
+
+    def reset_game(self):
+        """Reset the game to initial state."""
+        self.cells = bytearray(81)
+        self.x_grids = 0
+        self.o_grids = 0
+        self.drawn_grids = 0
+        self.current_player = 'X'
+        self.game_over = False
+        self.winner = None
+        self.active_grid = None
+        self.first_move = True
+        self.history = bytearray()
+
+    def copy(self):
+        """
+        Return an independent copy, history included.
+
+        Much cheaper than copy.deepcopy: two bytearray copies and a few
+        immutable attributes.
+
+        Returns:
+            CompactMegaTicTacToe: The copy
+        """
+        other = CompactMegaTicTacToe.__new__(type(self))
+        other.cells = bytearray(self.cells)
+        other.x_grids = self.x_grids
+        other.o_grids = self.o_grids
+        other.drawn_grids = self.drawn_grids
+        other.current_player = self.current_player
+        other.game_over = self.game_over
+        other.winner = self.winner
+        other.active_grid = self.active_grid
+        other.first_move = self.first_move
+        other.history = bytearray(self.history)
+        return other
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo):
+        """Deep copies need nothing beyond copy()."""
+        return self.copy()
+
+    def __getstate__(self):
+        """Pickle as one bytes blob plus a few small values."""
+        return (bytes(self.cells) + bytes(self.history), self.x_grids, self.o_grids,
+                self.drawn_grids, self.current_player, self.game_over, self.winner,
+                self.active_grid, self.first_move)
+
+    def __setstate__(self, state):
+        """Restore the attributes saved by __getstate__."""
+        (blob, self.x_grids, self.o_grids, self.drawn_grids, self.current_player,
+         self.game_over, self.winner, self.active_grid, self.first_move) = state
+        self.cells = bytearray(blob[:81])
+        self.history = bytearray(blob[81:])
+
+    @property
+    def grids(self):
+        """List-of-strings view of the 81 squares (built on demand)."""
+        marks = ' XO'
+        return [[marks[code] for code in self.cells[base:base + 9]] for base in range(0, 81, 9)]
+
+    @property
+    def grid_winners(self):
+        """List view of grid results: 'X', 'O', 'Draw' or None per grid."""
+        return [self._grid_result(grid_num) for grid_num in range(9)]
+
+    @property
+    def move_stack(self):
+        """
+        Undo records decoded from history, in the original class's shape.
+
+        Returns:
+            list: (grid_num, position, player, active_grid, first_move,
+                grid_changed, game_over, winner) tuples, oldest first
+        """
+        records = []
+        history = self.history
+        for index in range(0, len(history), 3):
+            square, flags, winner = history[index:index + 3]
+            active_grid = flags & 0x0F
+            records.append((square // 9, square % 9, 'O' if flags & 0x20 else 'X',
+                             None if active_grid == NO_GRID else active_grid,
+                             bool(flags & 0x10), bool(flags & 0x40), bool(flags & 0x80),
+                             _RESULTS[winner]))
+        return records
+
+    @property
+    def move_count(self):
+        """Number of pushed moves, counted without decoding the history."""
+        return len(self.history) // 3
+
+    def _place(self, grid_num, position, mark):
+        """Put a mark on an empty square without any rules checks."""
+        self.cells[grid_num * 9 + position] = _PLAYER_CODES[mark]
+
+    def is_valid_move(self, grid_num, position):
+        """
+        Check if a move is valid in the specified grid.
+
+        Args:
+            grid_num (int): The grid number (0-8)
+            position (int): The position within the grid (0-8)
+
+        Returns:
+            bool: True if move is valid, False otherwise
+        """
+        if not (0 <= grid_num < 9 and 0 <= position < 9):
+            return False
+
+        if self._decided_grids() >> grid_num & 1:
+            return False
+
+        if self.cells[grid_num * 9 + position] != EMPTY:
+            return False
+
+        if not self.first_move and self.active_grid is not None and grid_num != self.active_grid:
+            return False
+
+        return True
+
+    def make_move(self, grid_num, position):
+        """
+        Make a move on the specified grid.
+
+        Args:
+            grid_num (int): The grid number (0-8)
+            position (int): The position within the grid (0-8)
+        """
+        if self.is_valid_move(grid_num, position):
+            self.cells[grid_num * 9 + position] = _PLAYER_CODES[self.current_player]
+
+            # Check if this move wins (or fills) the grid
+            grid_winner = self.check_grid_winner(grid_num)
+            if grid_winner == 'X':
+                self.x_grids |= 1 << grid_num
+            elif grid_winner == 'O':
+                self.o_grids |= 1 << grid_num
+            elif grid_winner == 'Draw':
+                self.drawn_grids |= 1 << grid_num
+
+            # Set next active grid based on position played
+            # If that grid is decided, player can choose any available grid
+            if self._decided_grids() >> position & 1:
+                self.active_grid = None
+            else:
+                self.active_grid = position
+
+            self.first_move = False
+            return True
+        return False
+
+    def check_grid_winner(self, grid_num):
+        """
+        Check if there's a winner in a specific grid.
+
+        Args:
+            grid_num (int): The grid number (0-8)
+
+        Returns:
+            str: 'X', 'O', 'Draw', or None
+        """
+        cells = bytes(self.cells[grid_num * 9:grid_num * 9 + 9])
+        try:
+            return _GRID_OUTCOMES[cells]
+        except KeyError:
+            x_mask = o_mask = 0
+            for position, code in enumerate(cells):
+                if code == X:
+                    x_mask |= 1 << position
+                elif code == O:
+                    o_mask |= 1 << position
+            result = _GRID_OUTCOMES[cells] = outcome(x_mask, o_mask)
+            return result
+
+    def check_winner(self):
+        """
+        Check if there's a winner of the entire mega game.
+
+        Returns:
+            str: 'X', 'O', 'Draw', or None
+        """
+        return outcome(self.x_grids, self.o_grids, self.drawn_grids)
+
+    def push_move(self, grid_num, position):
+        """
+        Play a full turn: make the move, resolve the game and pass the turn.
+
+        Packs the undo delta into 3 bytes of history.
+
+        Args:
+            grid_num (int): The grid number (0-8)
+            position (int): The position within the grid (0-8)
+
+        Returns:
+            bool: True if the move was played, False if it was invalid
+        """
+        player = self.current_player
+        flags = ((NO_GRID if self.active_grid is None else self.active_grid)
+                 | self.first_move << 4 | (player == 'O') << 5 | self.game_over << 7)
+        winner = _RESULT_CODES[self.winner]
+        if not self.make_move(grid_num, position):
+            return False
+
+        flags |= (self._decided_grids() >> grid_num & 1) << 6
+        self.history += bytes((grid_num * 9 + position, flags, winner))
+
+        result = self.check_winner()
+        if result:
+            self.game_over = True
+            self.winner = result
+        else:
+            self.current_player = 'O' if player == 'X' else 'X'
+        return True
+
+    def pop_move(self):
+        """
+        Undo the last move played with push_move.
+
+        Returns:
+            tuple: The (grid_num, position) that was undone, or None if there
+                is nothing to undo
+        """
+        if not self.history:
+            return None
+        square, flags, winner = self.history[-3:]
+        del self.history[-3:]
+        grid_num, position = divmod(square, 9)
+        self.cells[square] = EMPTY
+        if flags & 0x40:
+            self._reopen_grid(grid_num)
+        active_grid = flags & 0x0F
+        self.current_player = 'O' if flags & 0x20 else 'X'
+        self.active_grid = None if active_grid == NO_GRID else active_grid
+        self.first_move = bool(flags & 0x10)
+        self.game_over = bool(flags & 0x80)
+        self.winner = _RESULTS[winner]
+        return (grid_num, position)
+
+    def switch_player(self):
+        """Switch to the other player."""
+        self.current_player = 'O' if self.current_player == 'X' else 'X'
+
+    def legal_moves_mask(self):
+        """
+        Return every legal move as one packed 81-bit mask.
+
+        Bit (grid * 9 + position) is set when is_valid_move(grid, position)
+        would return True. The empty squares are read in one pass by turning
+        the reversed cells into a string of binary digits.
+
+        Returns:
+            int: Packed mask of legal squares
+        """
+        empty = int(self.cells[::-1].translate(_EMPTY_DIGITS), 2)
+        return empty & EXPAND_TABLE[self._open_grids()]
+
+
+def cross_validate(games=200, seed=1234):
+    """
+    Play random games on CompactMegaTicTacToe and the original class side by side.
+
+    Every move compares the public state and legal moves, and a copy and a
+    pickle round trip must match too; pop_move must unwind back to a new game.
+    Raises AssertionError on the first mismatch.
+
+    Args:
+        games (int): Number of games
+        seed (int): Random seed
+
+    Returns:
+        int: Number of moves cross-checked
+    """
+    from rules import MegaTicTacToe
+
+    rng = random.Random(seed)
+    checked = 0
+    for n in range(games):
+        compact = CompactMegaTicTacToe()
+        game = MegaTicTacToe()
+        while not game.game_over:
+            expected = [(g, p) for g in range(9) for p in range(9) if game.is_valid_move(g, p)]
+            assert compact.legal_moves() == expected, f"game {n}: legal moves differ"
+            move = rng.choice(expected)
+            assert game.push_move(*move) and compact.push_move(*move), f"game {n}: move rejected"
+            checked += 1
+            for other in (compact, compact.copy(), pickle.loads(pickle.dumps(compact))):
+                assert other.grids == game.grids, f"game {n}: cells differ"
+                assert other.grid_winners == game.grid_winners, f"game {n}: grid winners differ"
+                assert other.move_stack == game.move_stack, f"game {n}: move stack differs"
+                assert (other.current_player, other.active_grid, other.first_move,
+                        other.game_over, other.winner) == \
+                    (game.current_player, game.active_grid, game.first_move,
+                     game.game_over, game.winner), f"game {n}: state differs"
+        while compact.pop_move():
+            pass
+        assert compact.cells == bytearray(81) and not compact.history, f"game {n}: pop_move left state"
+        assert (compact.current_player, compact.first_move, compact.winner) == ('X', True, None), \
+            f"game {n}: pop_move did not restore the start"
+    return checked
+
+
+def live_game_bytes(game_class, games, seed):
+    """
+    Measure the heap each live game uses, halfway through random games.
+
+    Args:
+        game_class (type): MegaTicTacToe-compatible class with push_move
+        games (int): Number of games to hold at once
+        seed (int): Random seed
+
+    Returns:
+        float: Bytes allocated per game while all games are alive
+    """
+    rng = random.Random(seed)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    live = []
+    for _ in range(games):
+        game = game_class()
+        for _ in range(30):
+            moves = [(g, p) for g in range(9) for p in range(9) if game.is_valid_move(g, p)]
+            if game.game_over or not moves:
+                break
+            game.push_move(*rng.choice(moves))
+        live.append(game)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / games
+
+
+def main():
+    """Cross-validate the compact state and report bytes per live game."""
+    from bitboard import BitboardMegaTicTacToe
+    from profiling import deep_sizeof
+    from rules import MegaTicTacToe
+
+    parser = argparse.ArgumentParser(description="MEGA TIC TAC TOE compact game state")
+    parser.add_argument('--games', type=int, default=2000, help='live games for the memory report')
+    parser.add_argument('--seed', type=int, default=1234, help='random seed')
+    parser.add_argument('--check', type=int, default=200, metavar='GAMES',
+                        help='games to cross-validate against MegaTicTacToe (0 to skip)')
+    args = parser.parse_args()
+
+    if args.check:
+        checked = cross_validate(args.check, args.seed)
+        print(f"✅ {checked} moves match MegaTicTacToe (including copy() and pickle)")
+
+    print(f"💾 Bytes per game ({args.games:,} live games, 30 moves each)")
+    baseline = None
+    for name, game_class in (('list', MegaTicTacToe), ('bitboard', BitboardMegaTicTacToe),
+                             ('compact', CompactMegaTicTacToe)):
+        per_game = live_game_bytes(game_class, args.games, args.seed)
+        baseline = baseline or per_game
+        game = game_class()
+        print(f"   {name:<10} {per_game:>8,.0f} bytes/game  ({per_game / baseline:.2f}x)  "
+              f"new game {deep_sizeof(game):,} bytes, pickled {len(pickle.dumps(game)):,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Scripted, non-interactive MEGA TIC TAC TOE driver.
+Plays move lists or player functions against the rules core with no I/O,
+for batch tools, servers and benchmarks; rendering is optional.
+"""
+
+import argparse
+
+from render import render_board, render_result
+from rules import MegaTicTacToe
+
+
+class ScriptError(ValueError):
+    """Raised when a scripted move is illegal."""
+
+
+def play_moves(moves, game=None):
+    """
+    Play a move list to the end (or until the game is decided).
+
+    Args:
+        moves (iterable): (grid_num, position) tuples, both 0-8
+        game (MegaTicTacToe): Game to continue; a new list-based game when None
+
+    Returns:
+        MegaTicTacToe: The game after the last move
+
+    Raises:
+        ScriptError: If a move is illegal or comes after the game ended
+    """
+    game = game if game is not None else MegaTicTacToe()
+    for index, (grid_num, position) in enumerate(moves):
+        if game.game_over:
+            raise ScriptError(f"move {index + 1} played after the game ended")
+        if not game.push_move(grid_num, position):
+            raise ScriptError(f"illegal move {index + 1}: grid {grid_num + 1}, position {position + 1}")
+    return game
+
+
+def play_match(players, game=None, on_move=None):
+    """
+    Let player functions play a full game without any console I/O.
+
+    Args:
+        players (dict): 'X'/'O' -> function taking the game and returning
+            (grid_num, position)
+        game (MegaTicTacToe): Game to play in; a new list-based game when None
+        on_move (callable): Optional callback(game, move) after every move
+
+    Returns:
+        MegaTicTacToe: The finished game
+
+    Raises:
+        ScriptError: If a player returns an illegal move
+    """
+    game = game if game is not None else MegaTicTacToe()
+    while not game.game_over:
+        move = players[game.current_player](game)
+        if move is None or not game.push_move(*move):
+            raise ScriptError(f"player {game.current_player} chose an illegal move: {move}")
+        if on_move:
+            on_move(game, move)
+    return game
+
+
+def parse_moves(text):
+    """
+    Parse moves written as 1-based "grid-position" pairs, e.g. "5-5 5-1".
+
+    Args:
+        text (str): Whitespace or comma separated moves
+
+    Returns:
+        list: (grid_num, position) tuples, both 0-8
+
+    Raises:
+        ValueError: If a token is not two numbers joined by '-'
+    """
+    moves = []
+    for token in text.replace(',', ' ').split():
+        grid_text, _, position_text = token.partition('-')
+        if not (grid_text.isdigit() and position_text.isdigit()):
+            raise ValueError(f"malformed move {token!r}, expected grid-position such as 5-5")
+        moves.append((int(grid_text) - 1, int(position_text) - 1))
+    return moves
+
+
+def main():
+    """Replay a scripted game and print the final board once."""
+    parser = argparse.ArgumentParser(description="MEGA TIC TAC TOE scripted driver")
+    parser.add_argument('moves', nargs='?', help='moves as 1-based grid-position pairs, e.g. "5-5 5-1"')
+    parser.add_argument('--file', help='read the moves from a file instead')
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file) as source:
+            text = source.read()
+    else:
+        text = args.moves or ''
+    try:
+        game = play_moves(parse_moves(text))
+    except (ScriptError, ValueError) as error:
+        parser.error(str(error))
+    frame = render_board(game)
+    if game.game_over:
+        frame += "\n" + render_result(game.winner)
+    print(frame)
+
+
+if __name__ == "__main__":
+    main()
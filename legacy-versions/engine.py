@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+MEGA TIC TAC TOE AI engine.
+Iterative-deepening negamax with alpha-beta pruning, move ordering and a
+transposition table over the bitboard state, scored by the pattern
+evaluation in evaluation.py, answering within a fixed time budget per move.
+"""
+
+import time
+
+from bitboard import BitboardMegaTicTacToe
+from evaluation import Evaluator
+from tables import WIN_TABLE
+from zobrist import EXACT, LOWER, UPPER, TranspositionTable
+
+DEFAULT_TIME_MS = 50
+MAX_DEPTH = 81
+WIN_SCORE = 100000  # Larger than any heuristic score; reduced by ply to prefer quick wins
+MATE_BOUND = WIN_SCORE - MAX_DEPTH  # Scores beyond this are forced wins/losses
+HEURISTIC_LIMIT = MATE_BOUND - 1    # Evaluator scores are clamped inside the forced-result range
+
+# Positional weight of each square of a 3x3 pattern: centre > corners > edges
+SQUARE_WEIGHTS = (3, 2, 3,
+                  2, 4, 2,
+                  3, 2, 3)
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget is used up."""
+
+
+_default_table = None
+
+
+def default_table():
+    """Return the shared transposition table, allocating it on first use."""
+    global _default_table
+    if _default_table is None:
+        _default_table = TranspositionTable()
+    return _default_table
+
+
+_default_evaluator = None
+
+
+def default_evaluator():
+    """Return the shared Evaluator with DEFAULT_WEIGHTS, building it on first use."""
+    global _default_evaluator
+    if _default_evaluator is None:
+        _default_evaluator = Evaluator()
+    return _default_evaluator
+
+
+def set_default_evaluator(evaluator):
+    """
+    Replace the shared evaluator, e.g. with one built from tuned weights.
+
+    Args:
+        evaluator (callable): Heuristic taking a bitboard state and
+            returning an int score for X
+    """
+    global _default_evaluator
+    _default_evaluator = evaluator
+
+
+def warm_up(table=True):
+    """
+    Build the shared evaluator (and table) now instead of on the first search.
+
+    Args:
+        table (bool): Also allocate the shared transposition table; pass
+            False when searches bring their own
+    """
+    default_evaluator()
+    if table:
+        default_table()
+
+
+def _to_table_score(score, ply):
+    """Store forced-win scores relative to the node rather than the root."""
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _from_table_score(score, ply):
+    """Convert a stored forced-win score back to distance from the root."""
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+def order_moves(state, moves):
+    """
+    Sort moves so the most promising are searched first.
+
+    Grid-winning moves come first, then moves blocking an opponent's grid
+    win; moves that hand the opponent a free choice of grid come last.
+
+    Args:
+        state (BitboardMegaTicTacToe): The position the moves are played from
+        moves (list): (grid_num, position) tuples
+
+    Returns:
+        list: The same moves, best first
+    """
+    if state.current_player == 'X':
+        own_masks, other_masks = state.x_masks, state.o_masks
+    else:
+        own_masks, other_masks = state.o_masks, state.x_masks
+    decided = state.x_grids | state.o_grids | state.drawn_grids
+
+    def move_score(move):
+        grid_num, position = move
+        bit = 1 << position
+        score = SQUARE_WEIGHTS[position]
+        if WIN_TABLE[own_masks[grid_num] | bit]:
+            score += 1000
+        elif WIN_TABLE[other_masks[grid_num] | bit]:
+            score += 500
+        if decided >> position & 1:
+            score -= 200
+        return score
+
+    return sorted(moves, key=move_score, reverse=True)
+
+
+class Search:
+    """One timed search from a root position."""
+
+    def __init__(self, state, time_ms, table=None, evaluator=None, db=None):
+        """
+        Prepare a search on a private bitboard copy of the position.
+
+        The clock starts first, so building the shared table or evaluator on
+        a first search counts against time_ms (see warm_up).
+
+        Args:
+            state (MegaTicTacToe): The position to search (left untouched)
+            time_ms (float): Time budget in milliseconds
+            table (TranspositionTable): Table to share results through;
+                defaults to the module's shared table
+            evaluator (callable): Heuristic taking the bitboard state and
+                returning an int score for X, clamped to ±HEURISTIC_LIMIT;
+                defaults to the shared Evaluator with DEFAULT_WEIGHTS
+            db (PositionDB): Optional position index whose stored best move
+                is reused when it was searched deep enough (see run)
+        """
+        self.deadline = time.perf_counter() + time_ms / 1000.0
+        self.state = BitboardMegaTicTacToe.from_game(state)
+        self.table = table if table is not None else default_table()
+        self.evaluate = evaluator or default_evaluator()
+        self.db = db
+        self.from_db = False  # True when run() answered from the position index
+        self.nodes = 0
+        self.depth_reached = 0
+        self.best_score = 0  # Root score of the last completed iteration
+
+    def negamax(self, depth, alpha, beta, ply):
+        """
+        Alpha-beta negamax search.
+
+        Args:
+            depth (int): Remaining depth in plies
+            alpha (int): Lower bound for the side to move
+            beta (int): Upper bound for the side to move
+            ply (int): Distance from the root
+
+        Returns:
+            int: Score from the side to move's point of view
+        """
+        self.nodes += 1
+        if self.nodes & 63 == 0 and time.perf_counter() >= self.deadline:
+            raise SearchTimeout()
+
+        state = self.state
+        if state.game_over:
+            if state.winner == 'Draw':
+                return 0
+            # Only the player who just moved can have won
+            return -(WIN_SCORE - ply)
+
+        if depth == 0:
+            score = self.evaluate(state)
+            # Custom weights can push a heuristic score past the mate bound
+            if score > HEURISTIC_LIMIT:
+                score = HEURISTIC_LIMIT
+            elif score < -HEURISTIC_LIMIT:
+                score = -HEURISTIC_LIMIT
+            return score if state.current_player == 'X' else -score
+
+        key = state.zobrist_key
+        entry = self.table.probe(key)
+        hash_move = None
+        if entry is not None:
+            stored_score, stored_depth, bound, hash_move = entry
+            if stored_depth >= depth:
+                stored_score = _from_table_score(stored_score, ply)
+                if bound == EXACT:
+                    return stored_score
+                if bound == LOWER and stored_score >= beta:
+                    return stored_score
+                if bound == UPPER and stored_score <= alpha:
+                    return stored_score
+
+        moves = state.legal_moves()
+        if not moves:
+            return 0
+        moves = order_moves(state, moves)
+        if hash_move is not None:
+            move = divmod(hash_move, 9)
+            if move in moves:
+                moves.remove(move)
+                moves.insert(0, move)
+
+        original_alpha = alpha
+        best = -WIN_SCORE
+        best_square = None
+        for grid_num, position in moves:
+            state.push_move(grid_num, position)
+            score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            state.pop_move()
+            if score > best:
+                best = score
+                best_square = grid_num * 9 + position
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if best <= original_alpha:
+            bound = UPPER
+        elif best >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table.store(key, _to_table_score(best, ply), depth, bound, best_square)
+        return best
+
+    def run(self, max_depth=MAX_DEPTH):
+        """
+        Iteratively deepen until the time budget or max_depth is reached.
+
+        With a position index, a stored best move searched to at least
+        max_depth (or proven a forced result) is returned without searching.
+        Otherwise it is searched first, and it is still the answer if its
+        stored depth is at least the deepest iteration this search completes.
+        A timed search rarely gets near MAX_DEPTH, so this is how rows
+        written by earlier, longer or luckier searches get reused.
+
+        Args:
+            max_depth (int): Deepest iteration to attempt
+
+        Returns:
+            tuple: (grid_num, position) of the best move, or None if there
+                are no legal moves
+        """
+        state = self.state
+        moves = order_moves(state, state.legal_moves())
+        if not moves:
+            return None
+
+        stored = None
+        if self.db is not None:
+            stored = self.db.lookup(state)
+            if stored is None or stored['best_move'] not in moves:
+                stored = None
+            elif stored['depth'] >= max_depth or abs(stored['evaluation']) >= MATE_BOUND:
+                return self._answer_from_db(stored)
+            else:
+                moves.remove(stored['best_move'])
+                moves.insert(0, stored['best_move'])
+
+        best_move = moves[0]
+        for depth in range(1, max_depth + 1):
+            iteration_best = None
+            alpha = -WIN_SCORE
+            try:
+                for move in moves:
+                    state.push_move(*move)
+                    score = -self.negamax(depth - 1, -WIN_SCORE, -alpha, 1)
+                    state.pop_move()
+                    if iteration_best is None or score > alpha:
+                        iteration_best = move
+                        alpha = score
+            except SearchTimeout:
+                # The private state is abandoned mid-line; keep the last
+                # completed iteration's answer
+                break
+
+            best_move = iteration_best
+            self.depth_reached = depth
+            self.best_score = alpha
+            # Search the previous best move first in the next iteration
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+            if abs(alpha) >= MATE_BOUND:
+                break  # Forced result found, deeper search cannot change it
+        if stored is not None and stored['depth'] >= self.depth_reached:
+            return self._answer_from_db(stored)
+        return best_move
+
+    def _answer_from_db(self, stored):
+        """Take a position index row as the search result and return its move."""
+        self.from_db = True
+        self.depth_reached = stored['depth']
+        self.best_score = int(stored['evaluation'])
+        return stored['best_move']
+
+
+def best_move(state, time_ms=DEFAULT_TIME_MS, max_depth=MAX_DEPTH, table=None, evaluator=None,
+              db=None):
+    """
+    Pick a move for the current player within a time budget.
+
+    Args:
+        state (MegaTicTacToe): Any MegaTicTacToe-compatible game state
+        time_ms (float): Time budget in milliseconds
+        max_depth (int): Deepest search iteration to attempt
+        table (TranspositionTable): Table to use instead of the shared one;
+            give each evaluator its own table, as stored scores depend on it
+        evaluator (callable): Heuristic to use instead of the default Evaluator
+        db (PositionDB): Optional position index to reuse stored best moves
+            from: rows at least max_depth deep (or proven forced results)
+            answer at once, and rows at least as deep as the last iteration
+            the timed search completes replace its answer
+
+    Returns:
+        tuple: (grid_num, position) both 0-8 indexed, or None if there are
+            no legal moves
+    """
+    return Search(state, time_ms, table, evaluator, db).run(max_depth)
+
+
+def ai_player(time_ms=DEFAULT_TIME_MS, choose=best_move):
+    """
+    Build a player function for MegaTicTacToe.play_game.
+
+    Args:
+        time_ms (float): Time budget per move in milliseconds
+        choose (callable): Move function taking (game, time_ms); defaults
+            to a live search
+
+    Returns:
+        callable: Takes the game and returns the bot's (grid_num, position)
+    """
+    warm_up()
+
+    def choose_move(game):
+        move = choose(game, time_ms)
+        if move is None:
+            return (-1, -1)
+        return move
+    return choose_move
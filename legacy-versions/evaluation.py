@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+Static evaluation for MEGA TIC TAC TOE.
+Scores positions from precomputed 3x3 pattern features (two-in-a-row
+threats, centre and corner control, free grid choice) with weights loaded
+from a JSON file, for single states or NumPy batches. Batches and weight
+fitting need NumPy; single-state scoring does not.
+"""
+
+import argparse
+import json
+import random
+import time
+
+from bitboard import BitboardMegaTicTacToe
+from tables import LINE_MASKS
+
+# Feature names in the order used by feature vectors and batch columns.
+# Every feature is X's count minus O's count, so scores are from X's view.
+FEATURES = (
+    'grid_threats',    # Two-in-a-row lines with the third square empty, in open grids
+    'cell_centre',     # Centre squares held in open grids
+    'cell_corners',    # Corner squares held in open grids
+    'grids_won',       # Grids won on the mega board
+    'mega_threats',    # Two won grids in a line with the third grid still open
+    'grid_centre',     # Centre grid won
+    'grid_corners',    # Corner grids won
+    'free_choice',     # Side to move may pick any grid (+1 for X to move, -1 for O)
+)
+
+# Hand-tuned starting point; scores are integers so they fit the transposition table
+DEFAULT_WEIGHTS = {
+    'grid_threats': 12,
+    'cell_centre': 4,
+    'cell_corners': 2,
+    'grids_won': 100,
+    'mega_threats': 60,
+    'grid_centre': 40,
+    'grid_corners': 20,
+    'free_choice': 15,
+}
+
+FIT_SCALE = 1000  # Score a certain win is worth when weights are fitted to outcomes
+
+CENTRE_MASK = 0b000010000
+CORNER_MASK = 0b101000101
+
+# TERNARY[mask] is the base-3 number with digit 1 at each set position, so
+# TERNARY[a] + 2 * TERNARY[b] indexes a pattern where a and b share no squares
+TERNARY = tuple(sum(3 ** pos for pos in range(9) if mask >> pos & 1) for mask in range(512))
+
+# POPCOUNT[mask] is the number of positions set in a 9-bit mask
+POPCOUNT = bytes(bin(mask).count('1') for mask in range(512))
+
+
+def _build_threat_table():
+    """
+    Return THREAT_TABLE[TERNARY[own] + 2 * TERNARY[blocked]].
+
+    Each entry counts the lines holding two of own's squares whose third
+    square is in neither mask.
+    """
+    table = bytearray(3 ** 9)
+    for own in range(512):
+        free = 511 ^ own
+        blocked = free
+        while True:
+            # Walk every subset of the squares own does not hold
+            table[TERNARY[own] + 2 * TERNARY[blocked]] = sum(
+                1 for line in LINE_MASKS
+                if POPCOUNT[own & line] == 2 and not blocked & line)
+            if not blocked:
+                break
+            blocked = (blocked - 1) & free
+    return bytes(table)
+
+
+# THREAT_TABLE counts one side's open two-in-a-rows in a ternary 3x3 pattern
+THREAT_TABLE = _build_threat_table()
+
+
+def state_features(state):
+    """
+    Compute the feature vector of one position.
+
+    Args:
+        state (MegaTicTacToe): Any MegaTicTacToe-compatible game state
+
+    Returns:
+        tuple: Feature values in FEATURES order, X minus O
+    """
+    if not hasattr(state, 'x_masks'):
+        state = BitboardMegaTicTacToe.from_game(state)
+    x_grids, o_grids = state.x_grids, state.o_grids
+    decided = x_grids | o_grids | state.drawn_grids
+    threats = centre = corners = 0
+    for grid_num in range(9):
+        if decided >> grid_num & 1:
+            continue
+        x_mask = state.x_masks[grid_num]
+        o_mask = state.o_masks[grid_num]
+        threats += (THREAT_TABLE[TERNARY[x_mask] + 2 * TERNARY[o_mask]]
+                    - THREAT_TABLE[TERNARY[o_mask] + 2 * TERNARY[x_mask]])
+        centre += POPCOUNT[x_mask & CENTRE_MASK] - POPCOUNT[o_mask & CENTRE_MASK]
+        corners += POPCOUNT[x_mask & CORNER_MASK] - POPCOUNT[o_mask & CORNER_MASK]
+    x_blocked = o_grids | state.drawn_grids
+    o_blocked = x_grids | state.drawn_grids
+    free_choice = 0
+    if state.active_grid is None and not state.game_over:
+        free_choice = 1 if state.current_player == 'X' else -1
+    return (threats, centre, corners,
+            POPCOUNT[x_grids] - POPCOUNT[o_grids],
+            THREAT_TABLE[TERNARY[x_grids] + 2 * TERNARY[x_blocked]]
+            - THREAT_TABLE[TERNARY[o_grids] + 2 * TERNARY[o_blocked]],
+            POPCOUNT[x_grids & CENTRE_MASK] - POPCOUNT[o_grids & CENTRE_MASK],
+            POPCOUNT[x_grids & CORNER_MASK] - POPCOUNT[o_grids & CORNER_MASK],
+            free_choice)
+
+
+def batch_features(cells, grid_results, active_grid, player):
+    """
+    Compute feature vectors for a batch of positions with array lookups.
+
+    Takes the arrays of batch.BatchMegaTicTacToe or of selfplay shards.
+
+    Args:
+        cells (np.ndarray): (N, 81) or (N, 9, 9) cell codes, 0 empty / 1 X / 2 O
+        grid_results (np.ndarray): (N, 9) codes, 0 open / 1 X / 2 O / 3 drawn
+        active_grid (np.ndarray): (N,) grid to play in, -1 for any grid
+        player (np.ndarray): (N,) side to move, 1 X / 2 O
+
+    Returns:
+        np.ndarray: (N, len(FEATURES)) int32, columns in FEATURES order
+    """
+    tables = _array_tables()
+    np = tables['np']
+    cells = np.asarray(cells).reshape(-1, 9, 9).astype(np.int32)
+    grid_results = np.asarray(grid_results)
+    patterns = cells @ tables['pow3']                    # (N, 9) ternary index per grid
+    open_grids = grid_results == 0
+
+    features = np.empty((len(patterns), len(FEATURES)), dtype=np.int32)
+    for column, name in enumerate(('grid_threats', 'cell_centre', 'cell_corners')):
+        features[:, column] = np.where(open_grids, tables[name][patterns], 0).sum(axis=1)
+
+    x_won = (grid_results == 1).astype(np.int32)
+    o_won = (grid_results == 2).astype(np.int32)
+    drawn = (grid_results == 3).astype(np.int32)
+    # Mega board patterns from each side's view: 1 own grid, 2 blocked grid
+    x_view = (x_won + 2 * (o_won | drawn)) @ tables['pow3']
+    o_view = (o_won + 2 * (x_won | drawn)) @ tables['pow3']
+    features[:, 3] = x_won.sum(axis=1) - o_won.sum(axis=1)
+    features[:, 4] = tables['threats'][x_view] - tables['threats'][o_view]
+    features[:, 5] = x_won[:, 4] - o_won[:, 4]
+    corner = [0, 2, 6, 8]
+    features[:, 6] = x_won[:, corner].sum(axis=1) - o_won[:, corner].sum(axis=1)
+
+    game_over = _mega_winner(tables, x_won, o_won) | ~open_grids.any(axis=1)
+    free = (np.asarray(active_grid) == -1) & ~game_over
+    features[:, 7] = np.where(free, np.where(np.asarray(player) == 1, 1, -1), 0)
+    return features
+
+
+def _mega_winner(tables, x_won, o_won):
+    """Return (N,) bool, True where either side has three grids in a line."""
+    bits = tables['bits']
+    return (tables['wins'][x_won @ bits] | tables['wins'][o_won @ bits]).astype(bool)
+
+
+_tables = None
+
+
+def _array_tables():
+    """Build the NumPy versions of the pattern tables on first use."""
+    global _tables
+    if _tables is None:
+        import numpy as np
+        from tables import WIN_TABLE
+
+        threats = np.frombuffer(THREAT_TABLE, dtype=np.uint8).astype(np.int32)
+        digits = np.arange(3 ** 9)[:, None] // 3 ** np.arange(9) % 3     # (19683, 9)
+        swapped = ((3 - digits) % 3) @ 3 ** np.arange(9)                 # X and O exchanged
+        x_centre, o_centre = digits[:, 4] == 1, digits[:, 4] == 2
+        corner_digits = digits[:, [0, 2, 6, 8]]
+        _tables = {
+            'np': np,
+            'pow3': 3 ** np.arange(9, dtype=np.int32),
+            'bits': 1 << np.arange(9, dtype=np.int32),
+            'wins': np.frombuffer(WIN_TABLE, dtype=np.uint8),
+            'threats': threats,
+            'grid_threats': threats - threats[swapped],
+            'cell_centre': x_centre.astype(np.int32) - o_centre,
+            'cell_corners': ((corner_digits == 1).sum(axis=1) - (corner_digits == 2).sum(axis=1)).astype(np.int32),
+        }
+    return _tables
+
+
+def load_weights(path):
+    """
+    Load evaluation weights from a JSON object of feature name -> weight.
+
+    Missing features keep their DEFAULT_WEIGHTS value.
+
+    Args:
+        path (str): JSON file
+
+    Returns:
+        dict: Complete weights, rounded to integers
+
+    Raises:
+        ValueError: If the file names an unknown feature or a non-number
+    """
+    with open(path) as source:
+        data = json.load(source)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a JSON object of feature weights")
+    unknown = sorted(set(data) - set(FEATURES))
+    if unknown:
+        raise ValueError(f"{path}: unknown features {', '.join(unknown)}")
+    weights = dict(DEFAULT_WEIGHTS)
+    for name, value in data.items():
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            raise ValueError(f"{path}: weight for {name} is not a number")
+        weights[name] = int(round(value))
+    return weights
+
+
+def save_weights(path, weights):
+    """
+    Write weights as JSON in FEATURES order.
+
+    Args:
+        path (str): Output file
+        weights (dict): Feature name -> weight
+    """
+    with open(path, 'w') as out:
+        json.dump({name: weights[name] for name in FEATURES}, out, indent=2)
+        out.write("\n")
+
+
+class Evaluator:
+    """
+    Weighted feature evaluation, callable on a single state.
+
+    The weights are folded into per-pattern score tables, so scoring a
+    position costs one lookup per open grid plus a few for the mega board.
+    Instances can be passed to engine.best_move as its evaluator.
+    """
+
+    def __init__(self, weights=None):
+        """
+        Args:
+            weights (dict): Feature name -> integer weight; missing features
+                use DEFAULT_WEIGHTS
+        """
+        self.weights = dict(DEFAULT_WEIGHTS)
+        self.weights.update(weights or {})
+        weight = self.weights
+        # One signed score per sub-grid pattern (X marks first, O marks second)
+        self.grid_table = [0] * 3 ** 9
+        for x_mask in range(512):
+            free = 511 ^ x_mask
+            o_mask = free
+            while True:
+                self.grid_table[TERNARY[x_mask] + 2 * TERNARY[o_mask]] = (
+                    weight['grid_threats'] * (THREAT_TABLE[TERNARY[x_mask] + 2 * TERNARY[o_mask]]
+                                              - THREAT_TABLE[TERNARY[o_mask] + 2 * TERNARY[x_mask]])
+                    + weight['cell_centre'] * (POPCOUNT[x_mask & CENTRE_MASK] - POPCOUNT[o_mask & CENTRE_MASK])
+                    + weight['cell_corners'] * (POPCOUNT[x_mask & CORNER_MASK] - POPCOUNT[o_mask & CORNER_MASK]))
+                if not o_mask:
+                    break
+                o_mask = (o_mask - 1) & free
+        # Score of one side's won grids on the mega board, threats excluded
+        self.won_table = [weight['grids_won'] * POPCOUNT[mask]
+                          + weight['grid_centre'] * POPCOUNT[mask & CENTRE_MASK]
+                          + weight['grid_corners'] * POPCOUNT[mask & CORNER_MASK]
+                          for mask in range(512)]
+
+    @classmethod
+    def from_file(cls, path):
+        """Build an evaluator from a weights file (see load_weights)."""
+        return cls(load_weights(path))
+
+    def __call__(self, state):
+        """
+        Score a position.
+
+        Args:
+            state (BitboardMegaTicTacToe): The position to score
+
+        Returns:
+            int: Score from X's point of view (positive is good for X)
+        """
+        x_masks, o_masks = state.x_masks, state.o_masks
+        x_grids, o_grids, drawn = state.x_grids, state.o_grids, state.drawn_grids
+        decided = x_grids | o_grids | drawn
+        grid_table = self.grid_table
+        score = (self.won_table[x_grids] - self.won_table[o_grids]
+                 + self.weights['mega_threats']
+                 * (THREAT_TABLE[TERNARY[x_grids] + 2 * TERNARY[o_grids | drawn]]
+                    - THREAT_TABLE[TERNARY[o_grids] + 2 * TERNARY[x_grids | drawn]]))
+        for grid_num in range(9):
+            if not decided >> grid_num & 1:
+                score += grid_table[TERNARY[x_masks[grid_num]] + 2 * TERNARY[o_masks[grid_num]]]
+        if state.active_grid is None and not state.game_over:
+            score += self.weights['free_choice'] if state.current_player == 'X' else -self.weights['free_choice']
+        return score
+
+    def evaluate_batch(self, cells, grid_results, active_grid, player):
+        """
+        Score a batch of positions (arguments as for batch_features).
+
+        Returns:
+            np.ndarray: (N,) int64 scores from X's point of view
+        """
+        vector = _array_tables()['np'].array([self.weights[name] for name in FEATURES], dtype='int64')
+        return batch_features(cells, grid_results, active_grid, player) @ vector
+
+
+def reference_features(game):
+    """
+    Compute the features the slow way, straight from a list-based game.
+
+    Used to cross-check the table lookups.
+
+    Args:
+        game (MegaTicTacToe): Any MegaTicTacToe-compatible game state
+
+    Returns:
+        tuple: Feature values in FEATURES order, X minus O
+    """
+    from tables import WINNING_COMBINATIONS
+
+    def threats(marks, player, empty):
+        return sum(1 for combo in WINNING_COMBINATIONS
+                   if [marks[pos] for pos in combo].count(player) == 2
+                   and any(marks[pos] == empty for pos in combo))
+
+    def sign(player):
+        return 1 if player == 'X' else -1
+
+    values = dict.fromkeys(FEATURES, 0)
+    for grid, winner in zip(game.grids, game.grid_winners):
+        if winner is None:
+            values['grid_threats'] += threats(grid, 'X', ' ') - threats(grid, 'O', ' ')
+            values['cell_centre'] += sum(sign(mark) for mark in grid[4:5] if mark != ' ')
+            values['cell_corners'] += sum(sign(grid[pos]) for pos in (0, 2, 6, 8) if grid[pos] != ' ')
+    winners = game.grid_winners
+    values['grids_won'] = sum(sign(winner) for winner in winners if winner in ('X', 'O'))
+    values['mega_threats'] = threats(winners, 'X', None) - threats(winners, 'O', None)
+    values['grid_centre'] = sum(sign(winner) for winner in winners[4:5] if winner in ('X', 'O'))
+    values['grid_corners'] = sum(sign(winners[pos]) for pos in (0, 2, 6, 8) if winners[pos] in ('X', 'O'))
+    if game.active_grid is None and not game.game_over:
+        values['free_choice'] = sign(game.current_player)
+    return tuple(values[name] for name in FEATURES)
+
+
+def random_positions(count, seed):
+    """
+    Collect positions from random games, including finished ones.
+
+    Args:
+        count (int): Number of positions
+        seed (int): Random seed
+
+    Returns:
+        list: BitboardMegaTicTacToe copies
+    """
+    rng = random.Random(seed)
+    positions = []
+    game = BitboardMegaTicTacToe()
+    while len(positions) < count:
+        positions.append(BitboardMegaTicTacToe.from_game(game))
+        if game.game_over:
+            game = BitboardMegaTicTacToe()
+        else:
+            game.push_move(*rng.choice(game.legal_moves()))
+    return positions
+
+
+def encode_batch(positions):
+    """
+    Turn bitboard states into the arrays batch_features takes.
+
+    Args:
+        positions (list): BitboardMegaTicTacToe states
+
+    Returns:
+        tuple: (cells, grid_results, active_grid, player) arrays
+    """
+    import numpy as np
+
+    cells = np.array([[' XO'.index(mark) for grid in state.grids for mark in grid]
+                      for state in positions], dtype=np.int8)
+    codes = {None: 0, 'X': 1, 'O': 2, 'Draw': 3}
+    grid_results = np.array([[codes[winner] for winner in state.grid_winners]
+                             for state in positions], dtype=np.int8)
+    active_grid = np.array([-1 if state.active_grid is None else state.active_grid
+                            for state in positions], dtype=np.int8)
+    player = np.array([1 if state.current_player == 'X' else 2 for state in positions], dtype=np.int8)
+    return cells, grid_results, active_grid, player
+
+
+def check(count=5000, seed=1234):
+    """
+    Cross-check table features, batch features and scores on random positions.
+
+    Raises AssertionError on the first mismatch.
+
+    Args:
+        count (int): Number of positions
+        seed (int): Random seed
+
+    Returns:
+        int: Number of positions checked
+    """
+    import numpy as np
+
+    positions = random_positions(count, seed)
+    evaluator = Evaluator({name: random.Random(seed + n).randint(-50, 50)
+                           for n, name in enumerate(FEATURES)})
+    vector = np.array([evaluator.weights[name] for name in FEATURES])
+    single = np.array([state_features(state) for state in positions])
+    for state, features in zip(positions, single):
+        assert tuple(features) == reference_features(state), \
+            f"features differ from the reference: {tuple(features)} vs {reference_features(state)}"
+        assert evaluator(state) == int(features @ vector), "evaluator score differs from the weighted features"
+    batch = batch_features(*encode_batch(positions))
+    assert (batch == single).all(), "batch features differ from single-state features"
+    assert (evaluator.evaluate_batch(*encode_batch(positions)) == single @ vector).all(), \
+        "batch scores differ"
+    return len(positions)
+
+
+def fit_weights(directory, scale=FIT_SCALE):
+    """
+    Fit weights to self-play outcomes by least squares.
+
+    Args:
+        directory (str): Output directory of selfplay.py
+        scale (float): Score a certain win maps to
+
+    Returns:
+        tuple: (weights dict, number of samples used)
+    """
+    import numpy as np
+    from selfplay import load_shards
+
+    data = load_shards(directory)
+    features = batch_features(data['cells'], data['grid_results'], data['active_grid'], data['player'])
+    # Outcomes are stored for the side to move; the features are from X's view
+    target = np.where(data['player'] == 1, data['outcome'], -data['outcome']).astype(float)
+    solution, *_ = np.linalg.lstsq(features.astype(float), target, rcond=None)
+    return {name: int(round(value * scale)) for name, value in zip(FEATURES, solution)}, len(target)
+
+
+def bench(count, seed):
+    """
+    Report positions scored per second, one at a time and as a batch.
+
+    Args:
+        count (int): Number of positions
+        seed (int): Random seed
+    """
+    positions = random_positions(count, seed)
+    evaluator = Evaluator()
+    print(f"📐 Scoring {count:,} random positions (seed {seed})")
+    start = time.perf_counter()
+    for state in positions:
+        evaluator(state)
+    rate = count / (time.perf_counter() - start)
+    print(f"   {'Evaluator':<16} {rate:>12,.0f} positions/sec")
+    try:
+        arrays = encode_batch(positions)
+    except ImportError:
+        return
+    start = time.perf_counter()
+    evaluator.evaluate_batch(*arrays)
+    rate = count / (time.perf_counter() - start)
+    print(f"   {'batch (NumPy)':<16} {rate:>12,.0f} positions/sec")
+
+
+def main():
+    """Check and benchmark the evaluation, or fit weights to self-play data."""
+    parser = argparse.ArgumentParser(description="MEGA TIC TAC TOE static evaluation")
+    parser.add_argument('--positions', type=int, default=20000, help='positions to benchmark')
+    parser.add_argument('--seed', type=int, default=1234, help='random seed')
+    parser.add_argument('--check', type=int, default=2000, metavar='POSITIONS',
+                        help='positions to cross-check against the reference features (0 to skip)')
+    parser.add_argument('--fit', metavar='DIR', help='fit weights to a selfplay.py output directory')
+    parser.add_argument('--out', default='weights.json', help='weights file written by --fit')
+    args = parser.parse_args()
+
+    if args.fit:
+        weights, samples = fit_weights(args.fit)
+        save_weights(args.out, weights)
+        print(f"✅ Fitted weights to {samples:,} samples, saved to {args.out}")
+        for name in FEATURES:
+            print(f"   {name:<14} {weights[name]:>6}")
+        return
+
+    if args.check:
+        print(f"✅ {check(args.check, args.seed)} positions match the reference features")
+    bench(args.positions, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Asyncio MEGA TIC TAC TOE game server.
+Hosts thousands of in-memory games (memory-lean CompactMegaTicTacToe
+states) in one process behind a small JSON HTTP/1.1 API (keep-alive
+connections), with a lock per game and eviction of idle games.
+
+API:
+    POST /games                     create a game
+    GET  /games/{code}              current state
+    POST /games/{code}/moves        play {"grid": 0-8, "position": 0-8}
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import string
+import time
+import traceback
+
+from compact import CompactMegaTicTacToe
+
+PORT = 5000
+IDLE_SECONDS = 30 * 60
+SWEEP_SECONDS = 60
+CODE_LENGTH = 4  # Same 4-letter game codes as the Laravel backend
+MAX_BODY_BYTES = 256  # A move body is under 64 bytes
+
+STATUS_TEXT = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found',
+               409: 'Conflict', 413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class GameSession:
+    """One hosted game with its own lock."""
+
+    __slots__ = ('code', 'game', 'lock', 'last_active')
+
+    def __init__(self, code):
+        self.code = code
+        self.game = CompactMegaTicTacToe()
+        self.lock = asyncio.Lock()
+        self.last_active = time.monotonic()
+
+    def state(self):
+        """
+        Serialise the game in the same shape as the web client's game_state.
+
+        Returns:
+            dict: code, grids, grid_winners, current_player, active_grid,
+                game_over, winner and move_count
+        """
+        game = self.game
+        return {
+            'code': self.code,
+            'grids': [[None if mark == ' ' else mark for mark in grid] for grid in game.grids],
+            'grid_winners': game.grid_winners,
+            'current_player': game.current_player,
+            'active_grid': game.active_grid,
+            'game_over': game.game_over,
+            'winner': game.winner,
+            'move_count': game.move_count,
+        }
+
+
+class GameRegistry:
+    """In-memory store of game sessions with idle eviction."""
+
+    def __init__(self, idle_seconds=IDLE_SECONDS, max_games=None):
+        """
+        Args:
+            idle_seconds (float): Games untouched this long are evicted
+            max_games (int): Optional cap on live games
+        """
+        self.sessions = {}
+        self.idle_seconds = idle_seconds
+        self.max_games = max_games
+        self.evicted = 0
+
+    def create(self):
+        """
+        Start a new game under a fresh code.
+
+        Returns:
+            GameSession: The new session, or None when the registry is full
+        """
+        if self.max_games is not None and len(self.sessions) >= self.max_games:
+            return None
+        while True:
+            code = ''.join(random.choices(string.ascii_uppercase, k=CODE_LENGTH))
+            if code not in self.sessions:
+                break
+        session = GameSession(code)
+        self.sessions[code] = session
+        return session
+
+    def get(self, code):
+        """Return the session for a code (touching it), or None."""
+        session = self.sessions.get(code)
+        if session is not None:
+            session.last_active = time.monotonic()
+        return session
+
+    def evict_idle(self):
+        """
+        Drop games idle for longer than idle_seconds.
+
+        Returns:
+            int: Number of games evicted
+        """
+        cutoff = time.monotonic() - self.idle_seconds
+        stale = [code for code, session in self.sessions.items()
+                 if session.last_active < cutoff and not session.lock.locked()]
+        for code in stale:
+            del self.sessions[code]
+        self.evicted += len(stale)
+        return len(stale)
+
+    async def sweep(self, interval=SWEEP_SECONDS):
+        """Evict idle games every `interval` seconds, forever."""
+        while True:
+            await asyncio.sleep(interval)
+            self.evict_idle()
+
+    async def play(self, code, grid_num, position):
+        """
+        Play a move in a game under its lock.
+
+        Args:
+            code (str): Game code
+            grid_num (int): The grid number (0-8)
+            position (int): The position within the grid (0-8)
+
+        Returns:
+            tuple: (HTTP status, response body)
+        """
+        session = self.get(code)
+        if session is None:
+            return 404, {'error': 'Game not found'}
+        async with session.lock:
+            if session.game.game_over:
+                return 409, {'error': 'Game is over'}
+            if not session.game.push_move(grid_num, position):
+                return 409, {'error': 'Invalid move'}
+            return 200, session.state()
+
+
+class GameServer:
+    """HTTP front end for a GameRegistry."""
+
+    def __init__(self, registry=None):
+        self.registry = registry or GameRegistry()
+        self.server = None
+        self._sweeper = None
+
+    async def start(self, host='0.0.0.0', port=PORT):
+        """
+        Start listening and sweeping idle games.
+
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind; 0 picks a free port
+
+        Returns:
+            int: The port actually bound
+        """
+        self.server = await asyncio.start_server(self.handle_connection, host, port, backlog=4096)
+        self._sweeper = asyncio.ensure_future(self.registry.sweep())
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stop listening and cancel the idle sweeper."""
+        self._sweeper.cancel()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def route(self, method, path, body):
+        """
+        Dispatch one request.
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path
+            body (bytes): Request body
+
+        Returns:
+            tuple: (HTTP status, JSON-serialisable response body)
+        """
+        parts = [part for part in path.split('?')[0].split('/') if part]
+        if parts == ['games'] and method == 'POST':
+            session = self.registry.create()
+            if session is None:
+                return 503, {'error': 'Too many games'}
+            return 201, session.state()
+        if len(parts) >= 2 and parts[0] == 'games':
+            code = parts[1].upper()
+            if len(parts) == 2 and method == 'GET':
+                session = self.registry.get(code)
+                if session is None:
+                    return 404, {'error': 'Game not found'}
+                return 200, session.state()
+            if parts[2:] == ['moves'] and method == 'POST':
+                try:
+                    move = json.loads(body)
+                    grid_num, position = move['grid'], move['position']
+                    # Only JSON integers; bools, floats (1e400 is inf) and strings are rejected
+                    if type(grid_num) is not int or type(position) is not int:
+                        raise TypeError('grid and position must be integers')
+                except (ValueError, KeyError, TypeError, OverflowError):
+                    return 400, {'error': 'Expected {"grid": 0-8, "position": 0-8}'}
+                return await self.registry.play(code, grid_num, position)
+        return 404, {'error': 'Not found'}
+
+    async def handle_connection(self, reader, writer):
+        """Serve keep-alive HTTP/1.1 requests on one connection."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                method, path, _ = lines[0].split(' ', 2)
+                headers = {}
+                for line in lines[1:]:
+                    if ':' in line:
+                        name, value = line.split(':', 1)
+                        headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                length = headers.get('content-length', '0')
+
+                if not (length.isascii() and length.isdigit()):
+                    # The body cannot be skipped without a length, so close after answering
+                    status, payload = 400, {'error': 'Invalid Content-Length'}
+                    keep_alive = False
+                elif int(length) > MAX_BODY_BYTES:
+                    status, payload = 413, {'error': f'Body over {MAX_BODY_BYTES} bytes'}
+                    keep_alive = False
+                else:
+                    length = int(length)
+                    body = await reader.readexactly(length) if length else b''
+                    try:
+                        status, payload = await self.route(method, path, body)
+                    except Exception:
+                        # Answer instead of dropping the connection, and keep the trace
+                        traceback.print_exc()
+                        status, payload = 500, {'error': 'Internal server error'}
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Cache-Control: no-cache, no-store, must-revalidate\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+class GameClient:
+    """Minimal keep-alive client for the game server (tests and load tests)."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        """Open the connection."""
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        """Close the connection."""
+        self.writer.close()
+        await self.writer.wait_closed()
+
+    async def request(self, method, path, payload=None):
+        """
+        Send one request and read the response.
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path
+            payload (dict): Optional JSON body
+
+        Returns:
+            tuple: (HTTP status, decoded JSON body)
+        """
+        body = b'' if payload is None else json.dumps(payload).encode()
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                          f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split(' ', 2)[1])
+        length = 0
+        for line in lines[1:]:
+            if line.lower().startswith('content-length:'):
+                length = int(line.split(':', 1)[1])
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def create_game(self):
+        """Create a game and return its state."""
+        return (await self.request('POST', '/games'))[1]
+
+    async def get_game(self, code):
+        """Return (status, state) of a game."""
+        return await self.request('GET', f'/games/{code}')
+
+    async def move(self, code, grid_num, position):
+        """Play a move; returns (status, state or error)."""
+        return await self.request('POST', f'/games/{code}/moves',
+                                  {'grid': grid_num, 'position': position})
+
+
+async def serve(host, port, idle_seconds):
+    """Run the server until interrupted."""
+    server = GameServer(GameRegistry(idle_seconds))
+    port = await server.start(host, port)
+    print("🎮 MEGA TIC TAC TOE game server running at:")
+    print(f"   http://localhost:{port}")
+    print("   Press Ctrl+C to stop the server")
+    await server.server.serve_forever()
+
+
+def main():
+    """Start the game server."""
+    parser = argparse.ArgumentParser(description="MEGA TIC TAC TOE asyncio game server")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--idle-seconds', type=float, default=IDLE_SECONDS,
+                        help='evict games idle for this long')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.idle_seconds))
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Load test for the asyncio game server.
+Creates N concurrent games, then plays random legal moves in all of them
+over a pool of keep-alive connections and reports p50/p99 move latency.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from bitboard import BitboardMegaTicTacToe
+from game_server import GameClient, GameServer
+
+
+def percentile(values, fraction):
+    """Return the value at `fraction` (0-1) of the sorted values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_load(host, port, games, connections, moves_per_game, seed):
+    """
+    Play `moves_per_game` random moves in each of `games` live games.
+
+    Args:
+        host (str): Server host
+        port (int): Server port
+        games (int): Concurrent games to create
+        connections (int): Client connections sharing the games
+        moves_per_game (int): Moves to play per game (fewer if it ends)
+        seed (int): Random seed
+
+    Returns:
+        dict: Latencies in milliseconds, moves played and elapsed seconds
+    """
+    rng = random.Random(seed)
+    clients = [GameClient(host, port) for _ in range(min(connections, games))]
+    await asyncio.gather(*(client.connect() for client in clients))
+
+    async def create(client, count):
+        return [(await client.create_game())['code'] for _ in range(count)]
+
+    shares = [games // len(clients) + (1 if i < games % len(clients) else 0)
+              for i in range(len(clients))]
+    codes = await asyncio.gather(*(create(client, share) for client, share in zip(clients, shares)))
+
+    latencies = []
+
+    async def play(client, client_codes):
+        # Mirror each game locally to pick legal moves
+        mirrors = {code: BitboardMegaTicTacToe() for code in client_codes}
+        for _ in range(moves_per_game):
+            for code, mirror in mirrors.items():
+                if mirror.game_over:
+                    continue
+                move = rng.choice(mirror.legal_moves())
+                start = time.perf_counter()
+                status, _ = await client.move(code, *move)
+                latencies.append((time.perf_counter() - start) * 1000)
+                if status != 200:
+                    raise RuntimeError(f"move rejected in game {code}: {status}")
+                mirror.push_move(*move)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(play(client, client_codes) for client, client_codes in zip(clients, codes)))
+    elapsed = time.perf_counter() - start
+    await asyncio.gather(*(client.close() for client in clients))
+    return {'latencies': latencies, 'moves': len(latencies), 'elapsed': elapsed}
+
+
+async def main_async(args):
+    """Run every load level against an in-process (or external) server."""
+    server = None
+    host, port = args.host, args.port
+    if port is None:
+        server = GameServer()
+        host = '127.0.0.1'
+        port = await server.start(host, 0)
+
+    print(f"🚦 Load test: {args.moves} moves per game over {args.connections} connections")
+    for games in args.games:
+        if server:
+            server.registry.sessions.clear()  # Measure each level on its own
+        result = await run_load(host, port, games, args.connections, args.moves, args.seed)
+        latencies = result['latencies']
+        live = len(server.registry.sessions) if server else games
+        print(f"   {games:>6} games  p50 {percentile(latencies, 0.50):7.2f} ms  "
+              f"p99 {percentile(latencies, 0.99):7.2f} ms  "
+              f"{result['moves'] / result['elapsed']:>9,.0f} moves/sec  ({live:,} live games)")
+
+    if server:
+        await server.stop()
+
+
+def main():
+    """Parse arguments and run the load test."""
+    parser = argparse.ArgumentParser(description="MEGA TIC TAC TOE game server load test")
+    parser.add_argument('--games', type=int, nargs='*', default=[1000, 5000, 10000],
+                        help='concurrent game counts to test')
+    parser.add_argument('--moves', type=int, default=5, help='moves per game')
+    parser.add_argument('--connections', type=int, default=200, help='client connections')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--host', default='127.0.0.1', help='external server host')
+    parser.add_argument('--port', type=int,
+                        help='external server port; an in-process server is used when omitted')
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Tree Search for MEGA TIC TAC TOE.
+Each worker process grows its own UCT tree from the root with random
+playouts (root parallelisation); root visit counts are summed to pick a move.
+"""
+
+import argparse
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bitboard import BitboardMegaTicTacToe
+
+DEFAULT_PLAYOUTS = 2000
+EXPLORATION = 1.41  # UCT exploration constant (about sqrt(2))
+
+
+class Node:
+    """A node of the search tree, reached by playing `move`."""
+
+    __slots__ = ('move', 'parent', 'children', 'untried', 'visits', 'wins', 'player')
+
+    def __init__(self, state, move=None, parent=None):
+        """
+        Create a node for the position currently held in state.
+
+        Args:
+            state (BitboardMegaTicTacToe): Position after `move` was played
+            move (tuple): (grid_num, position) leading here, None at the root
+            parent (Node): Parent node, None at the root
+        """
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = [] if state.game_over else state.legal_moves()
+        self.visits = 0
+        self.wins = 0.0  # From the point of view of the player who played `move`
+        # push_move only switches player when the game goes on
+        if parent is None:
+            self.player = None
+        elif state.game_over:
+            self.player = state.current_player
+        else:
+            self.player = 'O' if state.current_player == 'X' else 'X'
+
+    def select_child(self, exploration):
+        """Return the child with the highest UCT score."""
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.wins / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+
+def playout(state, rng):
+    """
+    Finish the game with uniformly random moves, then undo them.
+
+    Args:
+        state (BitboardMegaTicTacToe): Position to play out from
+        rng (random.Random): Source of randomness
+
+    Returns:
+        str: 'X', 'O' or 'Draw'
+    """
+    played = 0
+    while not state.game_over:
+        moves = state.legal_moves()
+        if not moves:
+            break
+        state.push_move(*rng.choice(moves))
+        played += 1
+    result = state.winner or 'Draw'
+    for _ in range(played):
+        state.pop_move()
+    return result
+
+
+def run_tree(state, playouts=DEFAULT_PLAYOUTS, seed=None, time_ms=None, exploration=EXPLORATION):
+    """
+    Grow one UCT tree from the root position.
+
+    Args:
+        state (MegaTicTacToe): Root position (left untouched)
+        playouts (int): Number of playouts to run
+        seed (int): Random seed; None for a non-deterministic search
+        time_ms (float): Optional time budget; stops early when exceeded
+        exploration (float): UCT exploration constant
+
+    Returns:
+        tuple: ({(grid_num, position): (visits, wins)} for root moves, with
+            wins from the side to move's point of view, and playouts run)
+    """
+    rng = random.Random(seed)
+    state = BitboardMegaTicTacToe.from_game(state)
+    root = Node(state)
+    deadline = None if time_ms is None else time.perf_counter() + time_ms / 1000.0
+
+    done = 0
+    while done < playouts:
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        node = root
+        depth = 0
+
+        # Selection: descend through fully expanded nodes
+        while not node.untried and node.children:
+            node = node.select_child(exploration)
+            state.push_move(*node.move)
+            depth += 1
+
+        # Expansion: add one untried move
+        if node.untried:
+            move = node.untried.pop(rng.randrange(len(node.untried)))
+            state.push_move(*move)
+            depth += 1
+            child = Node(state, move, node)
+            node.children.append(child)
+            node = child
+
+        # Simulation and backpropagation
+        result = playout(state, rng)
+        while node is not None:
+            node.visits += 1
+            if result == 'Draw':
+                node.wins += 0.5
+            elif result == node.player:
+                node.wins += 1.0
+            node = node.parent
+
+        for _ in range(depth):
+            state.pop_move()
+        done += 1
+
+    return {child.move: (child.visits, child.wins) for child in root.children}, done
+
+
+def search(state, playouts=DEFAULT_PLAYOUTS, workers=1, seed=None, time_ms=None,
+           executor=None):
+    """
+    Run root-parallel MCTS and sum the root visit counts of every tree.
+
+    With a seed and no time budget the result is fully deterministic: worker
+    i uses seed + i and runs a fixed share of the playouts.
+
+    Args:
+        state (MegaTicTacToe): Root position (left untouched)
+        playouts (int): Total playouts across all workers
+        workers (int): Number of trees / worker processes
+        seed (int): Base random seed; None for a non-deterministic search
+        time_ms (float): Optional time budget per worker
+        executor (ProcessPoolExecutor): Pool to reuse; one is created (and
+            shut down) per call when omitted and workers > 1
+
+    Returns:
+        tuple: ({(grid_num, position): visits}, total playouts run, root
+            score for the side to move from -1 (loss) to 1 (win))
+    """
+    state = BitboardMegaTicTacToe.from_game(state)
+    shares = [playouts // workers + (1 if i < playouts % workers else 0) for i in range(workers)]
+    seeds = [None if seed is None else seed + i for i in range(workers)]
+
+    if workers == 1:
+        results = [run_tree(state, shares[0], seeds[0], time_ms)]
+    else:
+        pool = executor or ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [pool.submit(run_tree, state, share, worker_seed, time_ms)
+                       for share, worker_seed in zip(shares, seeds)]
+            results = [future.result() for future in futures]
+        finally:
+            if executor is None:
+                pool.shutdown()
+
+    visits = {}
+    total = 0
+    wins = 0.0
+    for tree_visits, done in results:
+        total += done
+        for move, (count, move_wins) in tree_visits.items():
+            visits[move] = visits.get(move, 0) + count
+            wins += move_wins
+    score = 2.0 * wins / total - 1.0 if total else 0.0
+    return visits, total, score
+
+
+def best_move(state, playouts=DEFAULT_PLAYOUTS, workers=1, seed=None, time_ms=None,
+              executor=None, db=None):
+    """
+    Pick the most visited root move.
+
+    With a position index, the playouts are added to the root's visit count;
+    the root score and move are stored at depth 0, so they never replace an
+    alpha-beta result.
+
+    Args:
+        state (MegaTicTacToe): Any MegaTicTacToe-compatible game state
+        playouts (int): Total playouts across all workers
+        workers (int): Number of worker processes
+        seed (int): Base random seed for deterministic results
+        time_ms (float): Optional time budget per worker
+        executor (ProcessPoolExecutor): Pool to reuse across calls
+        db (PositionDB): Optional position index to record visits in
+
+    Returns:
+        tuple: (grid_num, position) both 0-8 indexed, or None if there are
+            no legal moves
+    """
+    visits, total, score = search(state, playouts, workers, seed, time_ms, executor)
+    if not visits:
+        return None
+    # Ties go to the lowest square so seeded searches stay reproducible
+    move = max(sorted(visits), key=lambda move: visits[move])
+    if db is not None:
+        db.store(state, score, move, visits=total, depth=0)
+    return move
+
+
+def bench(playouts, seed, max_workers):
+    """
+    Report playouts per second from the opening position per worker count.
+
+    Args:
+        playouts (int): Playouts per worker
+        seed (int): Base random seed
+        max_workers (int): Largest worker count to try
+    """
+    game = BitboardMegaTicTacToe()
+    print(f"🌳 MCTS playouts from the opening ({playouts} per worker, seed {seed})")
+    counts = [1 << n for n in range(max_workers.bit_length()) if 1 << n < max_workers]
+    baseline = None
+    for workers in counts + [max_workers]:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Warm the pool so process start-up is not timed
+            list(pool.map(abs, range(workers)))
+            start = time.perf_counter()
+            _, total, _ = search(game, playouts * workers, workers, seed, executor=pool)
+            elapsed = time.perf_counter() - start
+        rate = total / elapsed
+        baseline = baseline or rate
+        print(f"   {workers:>3} workers {rate:>12,.0f} playouts/sec  "
+              f"({rate / baseline:.2f}x, {rate / workers:,.0f} per core)")
+
+
+def main():
+    """Run the MCTS playout benchmark."""
+    parser = argparse.ArgumentParser(description="MEGA TIC TAC TOE MCTS benchmark")
+    parser.add_argument('--playouts', type=int, default=500, help='playouts per worker')
+    parser.add_argument('--seed', type=int, default=1234, help='base random seed')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='largest worker count to try')
+    args = parser.parse_args()
+    bench(args.playouts, args.seed, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Frozen copy of the original MEGA TIC TAC TOE rules from main.py.
+Nine lists of ' '/'X'/'O' strings, with the winning lines rebuilt and
+scanned on every check. benchmark.py replays it as the "before" row, so
+leave it as it is: optimisations belong in rules.py and the other states.
+"""
+
+
+class OriginalMegaTicTacToe:
+    def __init__(self):
+        """Initialize the game with 9 empty grids and starting player."""
+        # 9 grids, each with 9 positions (81 total squares)
+        self.grids = [[' ' for _ in range(9)] for _ in range(9)]
+        # Track which grids have been won and by whom
+        self.grid_winners = [None for _ in range(9)]
+        self.current_player = 'X'  # X always starts first
+        self.game_over = False
+        self.winner = None
+        self.active_grid = None  # Which grid the next player must play in
+        self.first_move = True  # First player can choose any grid
+
+    def is_valid_move(self, grid_num, position):
+        """
+        Check if a move is valid in the specified grid.
+
+        Args:
+            grid_num (int): The grid number (0-8)
+            position (int): The position within the grid (0-8)
+
+        Returns:
+            bool: True if move is valid, False otherwise
+        """
+        # Check if grid and position are in valid range
+        if not (0 <= grid_num < 9 and 0 <= position < 9):
+            return False
+
+        # Check if grid is already won
+        if self.grid_winners[grid_num] is not None:
+            return False
+
+        # Check if position is empty
+        if self.grids[grid_num][position] != ' ':
+            return False
+
+        # Check if player is allowed to play in this grid
+        if not self.first_move and self.active_grid is not None and grid_num != self.active_grid:
+            return False
+
+        return True
+
+    def make_move(self, grid_num, position):
+        """
+        Make a move on the specified grid.
+
+        Args:
+            grid_num (int): The grid number (0-8)
+            position (int): The position within the grid (0-8)
+        """
+        if self.is_valid_move(grid_num, position):
+            self.grids[grid_num][position] = self.current_player
+
+            # Check if this move wins the grid
+            grid_winner = self.check_grid_winner(grid_num)
+            if grid_winner:
+                self.grid_winners[grid_num] = grid_winner
+
+            # Set next active grid based on position played
+            # If that grid is won, player can choose any available grid
+            if self.grid_winners[position] is None:
+                self.active_grid = position
+            else:
+                self.active_grid = None
+
+            self.first_move = False
+            return True
+        return False
+
+    def check_grid_winner(self, grid_num):
+        """
+        Check if there's a winner in a specific grid.
+
+        Args:
+            grid_num (int): The grid number (0-8)
+
+        Returns:
+            str: 'X', 'O', 'Draw', or None
+        """
+        grid = self.grids[grid_num]
+
+        # Define all possible winning combinations
+        winning_combinations = [
+            # Rows
+            [0, 1, 2], [3, 4, 5], [6, 7, 8],
+            # Columns
+            [0, 3, 6], [1, 4, 7], [2, 5, 8],
+            # Diagonals
+            [0, 4, 8], [2, 4, 6]
+        ]
+
+        # Check for winning combinations
+        for combo in winning_combinations:
+            if (grid[combo[0]] == grid[combo[1]] == grid[combo[2]]
+                and grid[combo[0]] != ' '):
+                return grid[combo[0]]
+
+        # Check for draw (grid full)
+        if ' ' not in grid:
+            return 'Draw'
+
+        return None
+
+    def check_winner(self):
+        """
+        Check if there's a winner of the entire mega game.
+
+        Returns:
+            str: 'X', 'O', 'Draw', or None
+        """
+        # Define all possible winning combinations for the mega board
+        winning_combinations = [
+            # Rows
+            [0, 1, 2], [3, 4, 5], [6, 7, 8],
+            # Columns
+            [0, 3, 6], [1, 4, 7], [2, 5, 8],
+            # Diagonals
+            [0, 4, 8], [2, 4, 6]
+        ]
+
+        # Check for winning combinations
+        for combo in winning_combinations:
+            if (self.grid_winners[combo[0]] == self.grid_winners[combo[1]] == self.grid_winners[combo[2]]
+                and self.grid_winners[combo[0]] is not None
+                and self.grid_winners[combo[0]] != 'Draw'):
+                return self.grid_winners[combo[0]]
+
+        # Check for draw (all grids decided)
+        if all(winner is not None for winner in self.grid_winners):
+            return 'Draw'
+
+        return None
+
+    def switch_player(self):
+        """Switch to the other player."""
+        self.current_player = 'O' if self.current_player == 'X' else 'X'
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+On-disk MEGA TIC TAC TOE position index.
+Stores evaluation, visit count, search depth and best move per canonical
+position in SQLite, so every orientation of a position shares one row and
+engines and the opening book can reuse each other's results.
+Alpha-beta results carry their search depth; MCTS adds visits and keeps a
+depth-0 score from -1 to 1 that any searched result replaces.
+"""
+
+import argparse
+import sqlite3
+
+from symmetry import INVERSE, KEY_BYTES, canonicalize, transform_move
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    key BLOB PRIMARY KEY,
+    evaluation REAL NOT NULL,
+    visits INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    best_move INTEGER
+) WITHOUT ROWID
+"""
+
+
+class PositionDB:
+    """SQLite-backed table of results keyed by canonical position."""
+
+    def __init__(self, path=':memory:'):
+        """
+        Open (or create) a position database.
+
+        Args:
+            path (str): SQLite file, or ':memory:' for a temporary index
+        """
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Commit pending writes and close the database."""
+        self.connection.commit()
+        self.connection.close()
+
+    def commit(self):
+        """Commit pending writes."""
+        self.connection.commit()
+
+    def lookup(self, state):
+        """
+        Find the stored result for a position in any orientation.
+
+        Args:
+            state (MegaTicTacToe): The position to look up
+
+        Returns:
+            dict: evaluation, visits, depth and best_move (mapped back to the
+                state's own orientation, or None), or None if not stored
+        """
+        key, symmetry = canonicalize(state)
+        row = self.connection.execute(
+            'SELECT evaluation, visits, depth, best_move FROM positions WHERE key = ?',
+            (key.to_bytes(KEY_BYTES, 'big'),)).fetchone()
+        if row is None:
+            return None
+        evaluation, visits, depth, best_square = row
+        best_move = None
+        if best_square is not None:
+            best_move = transform_move(divmod(best_square, 9), INVERSE[symmetry])
+        return {'evaluation': evaluation, 'visits': visits, 'depth': depth, 'best_move': best_move}
+
+    def _row(self, state, evaluation, best_move, visits, depth):
+        """Build a canonical row for store/store_many."""
+        key, symmetry = canonicalize(state)
+        best_square = None
+        if best_move is not None:
+            grid_num, position = transform_move(best_move, symmetry)
+            best_square = grid_num * 9 + position
+        return (key.to_bytes(KEY_BYTES, 'big'), evaluation, visits, depth, best_square)
+
+    def store(self, state, evaluation, best_move=None, visits=1, depth=0):
+        """
+        Record a result for a position.
+
+        Visit counts accumulate; evaluation and best move are replaced only
+        by results searched at least as deep as the stored one.
+
+        Args:
+            state (MegaTicTacToe): The position
+            evaluation (float): Score for the side to move
+            best_move (tuple): (grid_num, position) in the state's orientation
+            visits (int): Visits to add
+            depth (int): Search depth behind the evaluation
+        """
+        self.store_many([(state, evaluation, best_move, visits, depth)])
+
+    def store_many(self, results):
+        """
+        Record many results in one statement.
+
+        Args:
+            results (iterable): (state, evaluation, best_move, visits, depth) tuples
+        """
+        self.connection.executemany("""
+            INSERT INTO positions (key, evaluation, visits, depth, best_move)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (key) DO UPDATE SET
+                visits = visits + excluded.visits,
+                evaluation = CASE WHEN excluded.depth >= depth
+                                  THEN excluded.evaluation ELSE evaluation END,
+                best_move = CASE WHEN excluded.depth >= depth
+                                 THEN excluded.best_move ELSE best_move END,
+                depth = MAX(depth, excluded.depth)
+        """, (self._row(*result) for result in results))
+
+    def __len__(self):
+        """Number of canonical positions stored."""
+        return self.connection.execute('SELECT COUNT(*) FROM positions').fetchone()[0]
+
+    def stats(self):
+        """
+        Summarise the index.
+
+        Returns:
+            dict: Position count, total visits and deepest stored search
+        """
+        count, visits, depth = self.connection.execute(
+            'SELECT COUNT(*), COALESCE(SUM(visits), 0), COALESCE(MAX(depth), 0) FROM positions'
+        ).fetchone()
+        return {'positions': count, 'visits': visits, 'max_depth': depth}
+
+
+def main():
+    """Print a summary of a position database."""
+    parser = argparse.ArgumentParser(description="MEGA TIC TAC TOE position index")
+    parser.add_argument('database', help='SQLite position database')
+    args = parser.parse_args()
+    with PositionDB(args.database) as database:
+        stats = database.stats()
+    print(f"📚 {stats['positions']:,} positions, {stats['visits']:,} visits, "
+          f"deepest search {stats['max_depth']}")
+
+
+if __name__ == "__main__":
+    main()
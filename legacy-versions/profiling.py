@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Optional profiling hooks for the MEGA TIC TAC TOE rules.
+Temporarily wraps rules methods to count calls and time spent per method,
+and measures how many bytes a game instance holds.
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+
+RULE_METHODS = ('is_valid_move', 'make_move', 'check_grid_winner', 'check_winner')
+
+
+class RuleProfiler:
+    """Call counts and inclusive time per profiled method."""
+
+    def __init__(self):
+        self.calls = {}
+        self.seconds = {}
+
+    def wrap(self, name, function):
+        """Return function wrapped to record its calls under name."""
+        calls = self.calls
+        seconds = self.seconds
+        calls.setdefault(name, 0)
+        seconds.setdefault(name, 0.0)
+        clock = time.perf_counter
+
+        def profiled(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                seconds[name] += clock() - start
+                calls[name] += 1
+
+        profiled.__wrapped__ = function
+        profiled.__doc__ = function.__doc__
+        return profiled
+
+    def stats(self):
+        """
+        Summarise the recorded calls.
+
+        Times are inclusive: make_move's time includes the is_valid_move
+        and check_grid_winner calls it makes.
+
+        Returns:
+            dict: name -> {'calls', 'seconds', 'mean_us'}
+        """
+        return {name: {'calls': self.calls[name],
+                       'seconds': self.seconds[name],
+                       'mean_us': self.seconds[name] / self.calls[name] * 1e6 if self.calls[name] else 0.0}
+                for name in self.calls}
+
+    def report(self):
+        """Return the stats as a printable table."""
+        lines = [f"   {'method':<20} {'calls':>10} {'total ms':>10} {'mean us':>9}"]
+        for name, stat in self.stats().items():
+            lines.append(f"   {name:<20} {stat['calls']:>10,} {stat['seconds'] * 1000:>10.1f} "
+                         f"{stat['mean_us']:>9.2f}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile_rules(game_class, methods=RULE_METHODS, profiler=None):
+    """
+    Count calls and time of rules methods on a class while the block runs.
+
+    Args:
+        game_class (type): MegaTicTacToe or a compatible class to instrument
+        methods (tuple): Method names to wrap
+        profiler (RuleProfiler): Profiler to record into; a new one if None
+
+    Yields:
+        RuleProfiler: The profiler receiving the counts
+    """
+    profiler = profiler or RuleProfiler()
+    originals = {name: game_class.__dict__.get(name) for name in methods}
+    for name in methods:
+        setattr(game_class, name, profiler.wrap(name, getattr(game_class, name)))
+    try:
+        yield profiler
+    finally:
+        for name, original in originals.items():
+            if original is None:
+                delattr(game_class, name)
+            else:
+                setattr(game_class, name, original)
+
+
+def deep_sizeof(obj, seen=None):
+    """
+    Estimate the bytes held by an object and everything it references.
+
+    Objects shared with the rest of the program (such as interned one-letter
+    strings, None and small ints) are counted once per call like any other.
+
+    Args:
+        obj: The object to measure
+        seen (set): ids already counted (used for recursion)
+
+    Returns:
+        int: Total bytes
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    if hasattr(obj, '__dict__'):
+        size += deep_sizeof(vars(obj), seen)
+    for name in getattr(type(obj), '__slots__', ()):
+        if hasattr(obj, name):
+            size += deep_sizeof(getattr(obj, name), seen)
+    return size
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Compact MEGA TIC TAC TOE game records.
+
+File layout:
+    b'NINE' + version byte, then one record per game:
+    [move count: 1 byte][result: 1 byte][one byte per move: grid * 9 + position]
+
+Files are read through mmap and replayed lazily, so files with millions of
+games never need to be loaded into memory.
+"""
+
+import argparse
+import json
+import mmap
+import random
+import time
+
+from bitboard import BitboardMegaTicTacToe
+
+MAGIC = b'NINE'
+VERSION = 1
+FILE_HEADER = MAGIC + bytes([VERSION])
+
+# Result byte values
+RESULT_CODES = {None: 0, 'X': 1, 'O': 2, 'Draw': 3}
+RESULTS = {code: result for result, code in RESULT_CODES.items()}
+
+
+class RecordError(ValueError):
+    """Raised for malformed record files or illegal recorded moves."""
+
+
+def encode_game(moves, result=None):
+    """
+    Encode one game as a record.
+
+    Args:
+        moves (list): (grid_num, position) tuples, both 0-8
+        result (str): 'X', 'O', 'Draw' or None for an unfinished game
+
+    Returns:
+        bytes: Record header followed by one byte per move
+
+    Raises:
+        RecordError: If there are more than 81 moves, a grid or position
+            is outside 0-8, or the result is unknown
+    """
+    if len(moves) > 81:
+        raise RecordError(f"a game has at most 81 moves, got {len(moves)}")
+    if result not in RESULT_CODES:
+        raise RecordError(f"unknown result {result!r}, expected 'X', 'O', 'Draw' or None")
+    for index, (grid_num, position) in enumerate(moves):
+        if not (0 <= grid_num <= 8 and 0 <= position <= 8):
+            raise RecordError(f"move {index + 1} off the board: grid {grid_num}, position {position}")
+    return bytes([len(moves), RESULT_CODES[result]]) + bytes(grid * 9 + pos for grid, pos in moves)
+
+
+def decode_game(data, offset=0):
+    """
+    Decode the record starting at offset.
+
+    Args:
+        data (bytes): Buffer holding records (bytes, mmap or memoryview)
+        offset (int): Start of the record in data
+
+    Returns:
+        tuple: (moves, result, offset of the next record)
+
+    Raises:
+        RecordError: If the record is truncated, has an unknown result or
+            a move byte outside the board
+    """
+    if offset + 2 > len(data):
+        raise RecordError(f"truncated record header at byte {offset}")
+    count, code = data[offset], data[offset + 1]
+    end = offset + 2 + count
+    if count > 81 or end > len(data) or code not in RESULTS:
+        raise RecordError(f"corrupt record at byte {offset}")
+    squares = data[offset + 2:end]
+    if count and max(squares) >= 81:
+        raise RecordError(f"move byte {max(squares)} out of range in record at byte {offset}")
+    moves = [divmod(square, 9) for square in squares]
+    return moves, RESULTS[code], end
+
+
+def write_records(path, games):
+    """
+    Stream games to a record file.
+
+    Args:
+        path (str): Output file
+        games (iterable): (moves, result) pairs
+
+    Returns:
+        int: Number of games written
+    """
+    written = 0
+    with open(path, 'wb') as out:
+        out.write(FILE_HEADER)
+        for moves, result in games:
+            out.write(encode_game(moves, result))
+            written += 1
+    return written
+
+
+def iter_records(path):
+    """
+    Lazily read every record of a file through a memory map.
+
+    Args:
+        path (str): Record file
+
+    Yields:
+        tuple: (moves, result) per game
+    """
+    with open(path, 'rb') as source:
+        header = source.read(len(FILE_HEADER))
+        if header[:len(MAGIC)] != MAGIC:
+            raise RecordError(f"{path} is not a game record file")
+        if header[len(MAGIC):] != bytes([VERSION]):
+            raise RecordError(f"{path} has unsupported record version")
+        if source.seek(0, 2) == len(FILE_HEADER):
+            return
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            offset = len(FILE_HEADER)
+            size = len(data)
+            while offset < size:
+                moves, result, offset = decode_game(data, offset)
+                yield moves, result
+
+
+def replay(moves, game_class=BitboardMegaTicTacToe):
+    """
+    Replay a move list into a fresh game.
+
+    Args:
+        moves (list): (grid_num, position) tuples
+        game_class (type): MegaTicTacToe-compatible class to replay into
+
+    Returns:
+        MegaTicTacToe: The game after the last move
+
+    Raises:
+        RecordError: If a move is illegal at its point in the game
+    """
+    game = game_class()
+    for index, (grid_num, position) in enumerate(moves):
+        if game.game_over or not game.push_move(grid_num, position):
+            raise RecordError(f"illegal move {index + 1}: grid {grid_num + 1}, position {position + 1}")
+    return game
+
+
+def replay_records(path, game_class=BitboardMegaTicTacToe):
+    """
+    Lazily replay every game of a record file.
+
+    Args:
+        path (str): Record file
+        game_class (type): MegaTicTacToe-compatible class to replay into
+
+    Yields:
+        tuple: (game, recorded result) per record
+    """
+    for moves, result in iter_records(path):
+        yield replay(moves, game_class), result
+
+
+def parse_json_moves(moves):
+    """
+    Normalise a JSON move list.
+
+    Accepts the {"grid": g, "position": p} objects sent by the web client's
+    move endpoint, or [grid, position] pairs, both 0-8 indexed.
+
+    Args:
+        moves (list): Moves as decoded from JSON
+
+    Returns:
+        list: (grid_num, position) tuples
+    """
+    parsed = []
+    for move in moves:
+        if isinstance(move, dict):
+            parsed.append((int(move['grid']), int(move['position'])))
+        else:
+            grid_num, position = move
+            parsed.append((int(grid_num), int(position)))
+    return parsed
+
+
+def import_json(json_path, record_path):
+    """
+    Convert a JSON file of games to a record file.
+
+    The JSON holds a list of games; each game is either a move list or an
+    object with a "moves" list. Results are recomputed by replaying, so
+    illegal games are rejected.
+
+    Args:
+        json_path (str): Input JSON file
+        record_path (str): Output record file
+
+    Returns:
+        int: Number of games converted
+    """
+    with open(json_path) as source:
+        games = json.load(source)
+
+    def converted():
+        for game in games:
+            moves = parse_json_moves(game['moves'] if isinstance(game, dict) else game)
+            yield moves, replay(moves).winner
+
+    return write_records(record_path, converted())
+
+
+def export_json(record_path, json_path):
+    """
+    Convert a record file to JSON, streaming one game at a time.
+
+    Args:
+        record_path (str): Input record file
+        json_path (str): Output JSON file
+
+    Returns:
+        int: Number of games converted
+    """
+    exported = 0
+    with open(json_path, 'w') as out:
+        out.write('[')
+        for moves, result in iter_records(record_path):
+            if exported:
+                out.write(',\n')
+            json.dump({'moves': [{'grid': g, 'position': p} for g, p in moves],
+                       'winner': result}, out)
+            exported += 1
+        out.write(']\n')
+    return exported
+
+
+def random_games(count, seed):
+    """
+    Generate random finished games, for benchmarks and sample files.
+
+    Args:
+        count (int): Number of games
+        seed (int): Random seed
+
+    Yields:
+        tuple: (moves, result) per game
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        game = BitboardMegaTicTacToe()
+        while not game.game_over:
+            game.push_move(*rng.choice(game.legal_moves()))
+        yield [move[:2] for move in game.move_stack], game.winner
+
+
+def main():
+    """Command-line tools for record files."""
+    parser = argparse.ArgumentParser(description="MEGA TIC TAC TOE game records")
+    commands = parser.add_subparsers(dest='command', required=True)
+    generate = commands.add_parser('generate', help='write random games to a record file')
+    generate.add_argument('output')
+    generate.add_argument('--games', type=int, default=10000)
+    generate.add_argument('--seed', type=int, default=1234)
+    to_records = commands.add_parser('import', help='convert JSON move lists to records')
+    to_records.add_argument('json_file')
+    to_records.add_argument('output')
+    to_json = commands.add_parser('export', help='convert records to JSON')
+    to_json.add_argument('record_file')
+    to_json.add_argument('output')
+    replay_file = commands.add_parser('replay', help='replay and verify every game of a file')
+    replay_file.add_argument('record_file')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == 'generate':
+        count = write_records(args.output, random_games(args.games, args.seed))
+        print(f"💾 Wrote {count} games to {args.output}")
+    elif args.command == 'import':
+        count = import_json(args.json_file, args.output)
+        print(f"💾 Imported {count} games into {args.output}")
+    elif args.command == 'export':
+        count = export_json(args.record_file, args.output)
+        print(f"💾 Exported {count} games to {args.output}")
+    else:
+        count = moves = mismatches = 0
+        for game, result in replay_records(args.record_file):
+            count += 1
+            moves += game.move_count
+            mismatches += game.winner != result
+        elapsed = time.perf_counter() - start
+        print(f"🔁 Replayed {count} games ({moves} moves, {mismatches} result mismatches)")
+        print(f"   {count / elapsed:,.0f} games/sec  {moves / elapsed:,.0f} moves/sec")
+        return
+    print(f"   {count / (time.perf_counter() - start):,.0f} games/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Text rendering for MEGA TIC TAC TOE.
+Builds each frame as a single string so callers write it with one print
+(or send it anywhere else) instead of printing line by line.
+"""
+
+WON_BLANK = "(           )"
+GRID_SEPARATOR = "( --+---+-- )"
+COLUMN_GAP = "  |  "
+ROW_SEPARATOR = "-" * 49
+BANNER = "=" * 65
+
+INSTRUCTIONS = "\n".join([
+    "🎮 MEGA TIC TAC TOE RULES:",
+    "- There are 9 grids (numbered 1-9) arranged in a 3x3 layout",
+    "- Each grid has 9 positions (numbered 1-9)",
+    "- First player can choose any grid to start",
+    "- After that, you must play in the grid matching the position number",
+    "  of the previous player's move",
+    "- Win a grid by getting 3 in a row within that grid",
+    "- Win the game by getting 3 grids in a row!",
+    "- Input format: First enter grid number (1-9), then position (1-9)",
+    "",
+])
+
+
+def grid_line(game, grid_num, line):
+    """
+    Render one content line of a grid.
+
+    Args:
+        game (MegaTicTacToe): The game to render
+        grid_num (int): The grid number (0-8)
+        line (int): Content line within the grid (0-2)
+
+    Returns:
+        str: The rendered line
+    """
+    winner = game.grid_winners[grid_num]
+
+    # If grid is won, show the winner symbol
+    if winner:
+        return f"(     {winner}     )" if line == 1 else WON_BLANK
+
+    # Show normal grid content, numbering empty squares when playable here
+    grid = game.grids[grid_num]
+    show_numbers = game.active_grid == grid_num or game.first_move
+    cells = []
+    for pos in range(line * 3, line * 3 + 3):
+        if grid[pos] == ' ':
+            cells.append(f"{pos + 1}" if show_numbers else " ")
+        else:
+            cells.append(grid[pos])
+    return "( " + " | ".join(cells) + " )"
+
+
+def render_board(game):
+    """
+    Render the mega board with all 9 grids in a 3x3 layout.
+
+    Args:
+        game (MegaTicTacToe): The game to render
+
+    Returns:
+        str: The whole frame, lines separated by newlines
+    """
+    lines = ["", BANNER, "                    MEGA TIC TAC TOE", BANNER]
+
+    # Show active grid info
+    if game.active_grid is not None:
+        lines.extend(["", f"🎯 Next move must be in Grid {game.active_grid + 1}"])
+    elif game.first_move:
+        lines.extend(["", f"🎯 Player {game.current_player} can choose any grid"])
+    lines.append("")
+
+    # Each grid row has 5 lines: content lines 0, 2, 4 and separators 1, 3
+    for grid_row in range(3):
+        grid_nums = range(grid_row * 3, grid_row * 3 + 3)
+        for line in range(5):
+            if line in (1, 3):
+                parts = [WON_BLANK if game.grid_winners[grid_num] else GRID_SEPARATOR
+                         for grid_num in grid_nums]
+            else:
+                parts = [grid_line(game, grid_num, line // 2) for grid_num in grid_nums]
+            lines.append(COLUMN_GAP.join(parts))
+        if grid_row < 2:
+            lines.append(ROW_SEPARATOR)
+
+    lines.append("")
+    return "\n".join(lines)
+
+
+def render_result(winner):
+    """
+    Render the final game result.
+
+    Args:
+        winner (str): 'X', 'O' or 'Draw'
+
+    Returns:
+        str: The result banner
+    """
+    if winner == 'Draw':
+        body = ["🤝 MEGA TIC TAC TOE RESULT: It's a draw!",
+                "All grids are filled - well played by both players!"]
+    else:
+        body = [f"🎉 MEGA TIC TAC TOE RESULT: Player {winner} wins!",
+                f"Congratulations to Player {winner} for winning 3 grids in a row!"]
+    return "\n".join(["", "=" * 50] + body + ["=" * 50])
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+MEGA TIC TAC TOE rules core.
+Pure game state and rules with no printing or input, so batch tools,
+servers and benchmarks can import it cheaply. Console play lives in main.py
+and text rendering in render.py.
+"""
+
+from tables import EXPAND_TABLE, FULL_GRID, outcome
+
+
+class GridMasksMixin:
+    """
+    Behaviour shared by every game state that keeps 9-bit grid result masks.
+
+    Classes using it keep x_grids / o_grids / drawn_grids (grids won by each
+    player or drawn) and must provide:
+        legal_moves_mask(): packed 81-bit mask of legal squares
+        _place(grid_num, position, mark): put 'X' or 'O' on an empty square
+            without rules checks (used by from_game)
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_game(cls, game):
+        """
+        Build a state of this class from any MegaTicTacToe-compatible game.
+
+        The move history is not carried over.
+
+        Args:
+            game (MegaTicTacToe): The game to convert
+
+        Returns:
+            MegaTicTacToe: An equivalent game of this class
+        """
+        state = cls()
+        grids = game.grids
+        grid_winners = game.grid_winners
+        for grid_num in range(9):
+            for position, mark in enumerate(grids[grid_num]):
+                if mark != ' ':
+                    state._place(grid_num, position, mark)
+            state._record_grid_result(grid_num, grid_winners[grid_num])
+        state.current_player = game.current_player
+        state.game_over = game.game_over
+        state.winner = game.winner
+        state.active_grid = game.active_grid
+        state.first_move = game.first_move
+        return state
+
+    @property
+    def move_count(self):
+        """Number of moves played with push_move that can still be undone."""
+        return len(self.move_stack)
+
+    def _record_grid_result(self, grid_num, result):
+        """Set a grid's bit in the mask for its result ('X', 'O', 'Draw' or None)."""
+        if result == 'X':
+            self.x_grids |= 1 << grid_num
+        elif result == 'O':
+            self.o_grids |= 1 << grid_num
+        elif result == 'Draw':
+            self.drawn_grids |= 1 << grid_num
+
+    def _reopen_grid(self, grid_num):
+        """
+        Clear a grid's result bits when the move that decided it is undone.
+
+        Moves are only legal in undecided grids, so the grid was open before
+        that move and simply has no result again.
+        """
+        reopen = ~(1 << grid_num)
+        self.x_grids &= reopen
+        self.o_grids &= reopen
+        self.drawn_grids &= reopen
+
+    def _grid_result(self, grid_num):
+        """Return the recorded result of a grid without rescanning cells."""
+        bit = 1 << grid_num
+        if self.x_grids & bit:
+            return 'X'
+        if self.o_grids & bit:
+            return 'O'
+        if self.drawn_grids & bit:
+            return 'Draw'
+        return None
+
+    def _decided_grids(self):
+        """Return the 9-bit mask of grids that are won or drawn."""
+        return self.x_grids | self.o_grids | self.drawn_grids
+
+    def _open_grids(self):
+        """Return the 9-bit mask of grids the side to move may play in."""
+        open_grids = ~self._decided_grids() & FULL_GRID
+        if not self.first_move and self.active_grid is not None:
+            return open_grids & 1 << self.active_grid
+        return open_grids
+
+    def legal_moves(self):
+        """
+        List every legal move.
+
+        Returns:
+            list: (grid_num, position) tuples in square order
+        """
+        moves = []
+        mask = self.legal_moves_mask()
+        while mask:
+            low = mask & -mask
+            square = low.bit_length() - 1
+            moves.append(divmod(square, 9))
+            mask ^= low
+        return moves
+
+
+class MegaTicTacToe(GridMasksMixin):
+    """
+    Game state and rules for one MEGA TIC TAC TOE game.
+
+    `grids` and `grid_winners` are the public lists of marks and grid
+    results. Alongside them each grid keeps a 9-bit mask per player
+    (x_masks / o_masks) and the board keeps grid result masks, so wins are
+    resolved with tables.outcome. Change the position through moves or
+    from_game so the masks stay in step.
+    """
+
+    def __init__(self):
+        """Initialize the game with 9 empty grids and starting player."""
+        # 9 grids, each with 9 positions (81 total squares)
+        self.grids = [[' ' for _ in range(9)] for _ in range(9)]
+        # Track which grids have been won and by whom
+        self.grid_winners = [None for _ in range(9)]
+        # 9-bit masks of each player's marks per grid, and of decided grids
+        self.x_masks = [0] * 9
+        self.o_masks = [0] * 9
+        self.x_grids = 0
+        self.o_grids = 0
+        self.drawn_grids = 0
+        self.current_player = 'X'  # X always starts first
+        self.game_over = False
+        self.winner = None
+        self.active_grid = None  # Which grid the next player must play in
+        self.first_move = True  # First player can choose any grid
+        self.move_stack = []  # Undo records for push_move/pop_move
+
+    def is_valid_move(self, grid_num, position):
+        """
+        Check if a move is valid in the specified grid.
+
+        Args:
+            grid_num (int): The grid number (0-8)
+            position (int): The position within the grid (0-8)
+
+        Returns:
+            bool: True if move is valid, False otherwise
+        """
+        # Check if grid and position are in valid range
+        if not (0 <= grid_num < 9 and 0 <= position < 9):
+            return False
+
+        # Check if grid is already won
+        if self.grid_winners[grid_num] is not None:
+            return False
+
+        # Check if position is empty
+        if self.grids[grid_num][position] != ' ':
+            return False
+
+        # Check if player is allowed to play in this grid
+        if not self.first_move and self.active_grid is not None and grid_num != self.active_grid:
+            return False
+
+        return True
+
+    def make_move(self, grid_num, position):
+        """
+        Make a move on the specified grid.
+
+        Args:
+            grid_num (int): The grid number (0-8)
+            position (int): The position within the grid (0-8)
+        """
+        if self.is_valid_move(grid_num, position):
+            self._place(grid_num, position, self.current_player)
+
+            # Check if this move wins the grid
+            grid_winner = self.check_grid_winner(grid_num)
+            if grid_winner:
+                self._record_grid_result(grid_num, grid_winner)
+
+            # Set next active grid based on position played
+            # If that grid is won, player can choose any available grid
+            if self.grid_winners[position] is None:
+                self.active_grid = position
+            else:
+                self.active_grid = None
+
+            self.first_move = False
+            return True
+        return False
+
+    def check_grid_winner(self, grid_num):
+        """
+        Check if there's a winner in a specific grid.
+
+        Args:
+            grid_num (int): The grid number (0-8)
+
+        Returns:
+            str: 'X', 'O', 'Draw', or None
+        """
+        return outcome(self.x_masks[grid_num], self.o_masks[grid_num])
+
+    def check_winner(self):
+        """
+        Check if there's a winner of the entire mega game.
+
+        Returns:
+            str: 'X', 'O', 'Draw', or None
+        """
+        return outcome(self.x_grids, self.o_grids, self.drawn_grids)
+
+    def _place(self, grid_num, position, mark):
+        """Put a mark on an empty square, keeping the per-grid masks in step."""
+        self.grids[grid_num][position] = mark
+        if mark == 'X':
+            self.x_masks[grid_num] |= 1 << position
+        else:
+            self.o_masks[grid_num] |= 1 << position
+
+    def _record_grid_result(self, grid_num, result):
+        """Record a grid's result in grid_winners and the grid result masks."""
+        self.grid_winners[grid_num] = result
+        super()._record_grid_result(grid_num, result)
+
+    def _reopen_grid(self, grid_num):
+        """Clear a grid's result in grid_winners and the grid result masks."""
+        self.grid_winners[grid_num] = None
+        super()._reopen_grid(grid_num)
+
+    def legal_moves_mask(self):
+        """
+        Return every legal move as one packed 81-bit mask.
+
+        Bit (grid * 9 + position) is set when is_valid_move(grid, position)
+        would return True.
+
+        Returns:
+            int: Packed mask of legal squares
+        """
+        empty = 0
+        for grid_num in range(9):
+            empty |= (self.x_masks[grid_num] | self.o_masks[grid_num]) << (grid_num * 9)
+        return ~empty & EXPAND_TABLE[self._open_grids()]
+
+    def push_move(self, grid_num, position):
+        """
+        Play a full turn: make the move, resolve the game and pass the turn.
+
+        Only the delta needed to undo the move is recorded on move_stack, so
+        alternatives can be explored with pop_move instead of copying the game.
+
+        Args:
+            grid_num (int): The grid number (0-8)
+            position (int): The position within the grid (0-8)
+
+        Returns:
+            bool: True if the move was played, False if it was invalid
+        """
+        player = self.current_player
+        active_grid = self.active_grid
+        first_move = self.first_move
+        game_over = self.game_over
+        winner = self.winner
+        if not self.make_move(grid_num, position):
+            return False
+
+        grid_changed = self.grid_winners[grid_num] is not None
+        self.move_stack.append((grid_num, position, player, active_grid, first_move,
+                                grid_changed, game_over, winner))
+
+        result = self.check_winner()
+        if result:
+            self.game_over = True
+            self.winner = result
+        else:
+            self.switch_player()
+        return True
+
+    def pop_move(self):
+        """
+        Undo the last move played with push_move.
+
+        Returns:
+            tuple: The (grid_num, position) that was undone, or None if there
+                is nothing to undo
+        """
+        if not self.move_stack:
+            return None
+        (grid_num, position, player, active_grid, first_move,
+         grid_changed, game_over, winner) = self.move_stack.pop()
+        self.grids[grid_num][position] = ' '
+        clear = ~(1 << position)
+        self.x_masks[grid_num] &= clear
+        self.o_masks[grid_num] &= clear
+        if grid_changed:
+            self._reopen_grid(grid_num)
+        self.current_player = player
+        self.active_grid = active_grid
+        self.first_move = first_move
+        self.game_over = game_over
+        self.winner = winner
+        return (grid_num, position)
+
+    def switch_player(self):
+        """Switch to the other player."""
+        self.current_player = 'O' if self.current_player == 'X' else 'X'
+
+    def reset_game(self):
+        """Reset the game to initial state."""
+        self.grids = [[' ' for _ in range(9)] for _ in range(9)]
+        self.grid_winners = [None for _ in range(9)]
+        self.x_masks = [0] * 9
+        self.o_masks = [0] * 9
+        self.x_grids = 0
+        self.o_grids = 0
+        self.drawn_grids = 0
+        self.current_player = 'X'
+        self.game_over = False
+        self.winner = None
+        self.active_grid = None
+        self.first_move = True
+        self.move_stack = []
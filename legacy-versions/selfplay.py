@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Self-play training data for MEGA TIC TAC TOE.
+Worker processes play engine-vs-engine games and stream every position's
+(position, legal-move mask, outcome) samples through a bounded queue to a
+writer that saves them as sharded, compressed NumPy files. Progress is kept
+in the output directory so an interrupted run resumes where it stopped.
+Requires NumPy.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import random
+import signal
+import time
+import traceback
+
+import numpy as np
+
+from bitboard import BitboardMegaTicTacToe
+from engine import best_move, warm_up
+from zobrist import TranspositionTable
+
+PROGRESS_FILE = 'progress.json'
+SHARD_NAME = 'shard-{:05d}.npz'
+DEFAULT_TIME_MS = 20
+RANDOM_PLIES = 4  # Uniformly random opening moves, so games differ
+REPORT_SECONDS = 5.0
+
+# Settings that must match when resuming into an existing directory
+RUN_SETTINGS = ('seed', 'time_ms', 'random_plies')
+
+
+def bits(value, count):
+    """
+    Unpack the low bits of a packed integer mask.
+
+    Args:
+        value (int): Packed mask
+        count (int): Number of bits to unpack
+
+    Returns:
+        np.ndarray: (count,) bool, index i is bit i
+    """
+    packed = np.frombuffer(value.to_bytes((count + 7) // 8, 'little'), dtype=np.uint8)
+    return np.unpackbits(packed, bitorder='little')[:count].astype(bool)
+
+
+def encode_position(state):
+    """
+    Encode one position as sample arrays.
+
+    Args:
+        state (BitboardMegaTicTacToe): Position before the move is played
+
+    Returns:
+        tuple: (cells (81,) int8 with 0 empty / 1 X / 2 O, grid results (9,)
+            int8 with 0 open / 1 X / 2 O / 3 drawn, active grid (-1 for any),
+            player to move (1 X / 2 O), legal moves (81,) bool)
+    """
+    cells = bits(state.x_cells, 81).astype(np.int8) + 2 * bits(state.o_cells, 81).astype(np.int8)
+    grids = (bits(state.x_grids, 9).astype(np.int8) + 2 * bits(state.o_grids, 9).astype(np.int8)
+             + 3 * bits(state.drawn_grids, 9).astype(np.int8))
+    active = -1 if state.first_move or state.active_grid is None else state.active_grid
+    player = 1 if state.current_player == 'X' else 2
+    return cells, grids, active, player, bits(state.legal_moves_mask(), 81)
+
+
+def play_game(index, seed, time_ms=DEFAULT_TIME_MS, random_plies=RANDOM_PLIES, table=None):
+    """
+    Play one engine-vs-engine game and turn every position into a sample.
+
+    Args:
+        index (int): Game number; with seed it fixes the random opening
+        seed (int): Base random seed
+        time_ms (float): Search time per engine move
+        random_plies (int): Number of uniformly random opening moves
+        table (TranspositionTable): Table for the engine; a private one if None
+
+    Returns:
+        dict: Arrays with one row per position: cells, grid_results,
+            active_grid, player, legal, outcome (+1 win / 0 draw / -1 loss
+            for the player to move) and game (the game number)
+    """
+    rng = random.Random(seed + index)
+    table = table if table is not None else TranspositionTable()
+    game = BitboardMegaTicTacToe()
+    positions = []
+    while not game.game_over:
+        positions.append(encode_position(game))
+        if len(positions) <= random_plies:
+            move = rng.choice(game.legal_moves())
+        else:
+            move = best_move(game, time_ms, table=table)
+        game.push_move(*move)
+
+    cells, grids, active, player, legal = zip(*positions)
+    player = np.array(player, dtype=np.int8)
+    if game.winner == 'Draw':
+        outcome = np.zeros(len(player), dtype=np.int8)
+    else:
+        outcome = np.where(player == (1 if game.winner == 'X' else 2), 1, -1).astype(np.int8)
+    return {
+        'cells': np.array(cells),
+        'grid_results': np.array(grids),
+        'active_grid': np.array(active, dtype=np.int8),
+        'player': player,
+        'legal': np.array(legal),
+        'outcome': outcome,
+        'game': np.full(len(player), index, dtype=np.int32),
+    }
+
+
+def worker(tasks, results, stop, seed, time_ms, random_plies):
+    """
+    Play games from the task queue until a None sentinel arrives or stop is set.
+
+    results.put blocks while the queue is full, so workers wait for the
+    writer instead of piling finished games up in memory.
+
+    Args:
+        tasks (multiprocessing.Queue): Game numbers to play
+        results (multiprocessing.Queue): Receives (index, samples) or
+            (index, None, error text)
+        stop (multiprocessing.Event): Set by the parent to stop after the
+            current game
+        seed (int): Base random seed
+        time_ms (float): Search time per engine move
+        random_plies (int): Number of random opening moves
+    """
+    # Ctrl-C is handled by the parent, which saves finished games and stops us
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    table = TranspositionTable()
+    warm_up(table=False)
+    for index in iter(tasks.get, None):
+        if stop.is_set():
+            return
+        try:
+            results.put((index, play_game(index, seed, time_ms, random_plies, table)))
+        except Exception:
+            results.put((index, None, traceback.format_exc()))
+            return
+
+
+def game_ranges(indices):
+    """
+    Compress game numbers into [start, stop) ranges.
+
+    Args:
+        indices (iterable): Game numbers
+
+    Returns:
+        list: [start, stop] pairs in increasing order
+    """
+    ranges = []
+    for index in sorted(indices):
+        if ranges and ranges[-1][1] == index:
+            ranges[-1][1] += 1
+        else:
+            ranges.append([index, index + 1])
+    return ranges
+
+
+class ShardWriter:
+    """Collects whole games into shards and records progress after each one."""
+
+    def __init__(self, directory, settings, shard_size):
+        """
+        Open (or resume) an output directory.
+
+        Args:
+            directory (str): Output directory, created if needed
+            settings (dict): Run settings; must match a resumed run
+            shard_size (int): Samples per shard (a shard always holds whole games)
+
+        Raises:
+            SystemExit: If the directory holds a run with different settings
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.shard_size = shard_size
+        self.progress_path = os.path.join(directory, PROGRESS_FILE)
+        if os.path.exists(self.progress_path):
+            with open(self.progress_path) as source:
+                self.progress = json.load(source)
+            saved = {name: self.progress['settings'].get(name) for name in RUN_SETTINGS}
+            wanted = {name: settings[name] for name in RUN_SETTINGS}
+            if saved != wanted:
+                raise SystemExit(f"❌ {directory} holds a run with settings {saved}, not {wanted}")
+        else:
+            self.progress = {'settings': settings, 'shards': []}
+        # Each shard lists its own games as ranges, so progress grows with
+        # the number of shards rather than being rewritten per game
+        self.done = {index for shard in self.progress['shards']
+                     for start, stop in shard['game_ranges'] for index in range(start, stop)}
+        self.pending = []
+        self.pending_samples = 0
+
+    def add(self, index, samples):
+        """Queue one finished game, writing a shard when enough samples wait."""
+        self.pending.append((index, samples))
+        self.pending_samples += len(samples['outcome'])
+        if self.pending_samples >= self.shard_size:
+            self.flush()
+
+    def flush(self):
+        """Write waiting games as a new shard and save progress (both atomically)."""
+        if not self.pending:
+            return
+        name = SHARD_NAME.format(len(self.progress['shards']))
+        arrays = {key: np.concatenate([samples[key] for _, samples in self.pending])
+                  for key in self.pending[0][1]}
+        path = os.path.join(self.directory, name)
+        with open(path + '.tmp', 'wb') as out:
+            np.savez_compressed(out, **arrays)
+        os.replace(path + '.tmp', path)
+
+        games = [index for index, _ in self.pending]
+        self.done.update(games)
+        self.progress['shards'].append({'file': name, 'samples': self.pending_samples,
+                                        'games': len(games), 'game_ranges': game_ranges(games)})
+        with open(self.progress_path + '.tmp', 'w') as out:
+            json.dump(self.progress, out)
+        os.replace(self.progress_path + '.tmp', self.progress_path)
+        self.pending = []
+        self.pending_samples = 0
+
+
+def generate(directory, games, workers=None, seed=1234, time_ms=DEFAULT_TIME_MS,
+             random_plies=RANDOM_PLIES, shard_size=50000, queue_size=None, report=print):
+    """
+    Play self-play games in parallel and save their samples as shards.
+
+    Games already recorded in the directory's progress file are skipped, so
+    calling this again after an interruption finishes the remaining games.
+
+    Args:
+        directory (str): Output directory
+        games (int): Total number of games the run should contain
+        workers (int): Worker processes; os.cpu_count() when None
+        seed (int): Base random seed
+        time_ms (float): Search time per engine move
+        random_plies (int): Number of random opening moves per game
+        shard_size (int): Samples per shard
+        queue_size (int): Finished games that may wait for the writer;
+            4 per worker when None
+        report (callable): Receives progress lines; None for silence
+
+    Returns:
+        tuple: (games played now, samples written now, elapsed seconds)
+    """
+    workers = workers or os.cpu_count() or 1
+    settings = {'seed': seed, 'time_ms': time_ms, 'random_plies': random_plies}
+    writer = ShardWriter(directory, settings, shard_size)
+    todo = [index for index in range(games) if index not in writer.done]
+    if report and writer.done:
+        report(f"↩️  Resuming: {len(writer.done):,} games already in {directory}")
+    if not todo:
+        return 0, 0, 0.0
+
+    context = multiprocessing.get_context()
+    tasks = context.Queue()
+    results = context.Queue(maxsize=queue_size or 4 * workers)
+    stop = context.Event()
+    for index in todo:
+        tasks.put(index)
+    for _ in range(workers):
+        tasks.put(None)
+    processes = [context.Process(target=worker, args=(tasks, results, stop, seed, time_ms, random_plies),
+                                 daemon=True) for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    played = samples = 0
+    start = last_report = time.perf_counter()
+    try:
+        while played < len(todo):
+            try:
+                message = results.get(timeout=1.0)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    raise SystemExit("❌ All workers exited before the run finished")
+                continue
+            if message[1] is None:
+                raise SystemExit(f"❌ Game {message[0]} failed in a worker:\n{message[2]}")
+            writer.add(*message)
+            played += 1
+            samples += len(message[1]['outcome'])
+            now = time.perf_counter()
+            if report and now - last_report >= REPORT_SECONDS:
+                last_report = now
+                report(f"   {played:>8,}/{len(todo):,} games {samples:>10,} samples "
+                       f"{samples / (now - start):>9,.0f} samples/sec")
+    finally:
+        # Keep every finished game, even when stopping early: workers finish
+        # the game in hand and exit, and their results are collected until
+        # they have all gone (reading also unblocks any worker waiting on a
+        # full queue)
+        stop.set()
+        while True:
+            alive = any(process.is_alive() for process in processes)
+            try:
+                message = results.get(timeout=0.1)
+            except queue.Empty:
+                if not alive:
+                    break
+                continue
+            if message[1] is not None:
+                writer.add(*message)
+        writer.flush()
+        for process in processes:
+            process.join()
+    return played, samples, time.perf_counter() - start
+
+
+def load_shards(directory):
+    """
+    Load every shard of a run into single arrays.
+
+    Args:
+        directory (str): Output directory of generate()
+
+    Returns:
+        dict: Array name -> concatenated array over all shards
+    """
+    with open(os.path.join(directory, PROGRESS_FILE)) as source:
+        shards = json.load(source)['shards']
+    parts = []
+    for shard in shards:
+        with np.load(os.path.join(directory, shard['file'])) as data:
+            parts.append({key: data[key] for key in data.files})
+    if not parts:
+        return {}
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+def check(games=5, seed=1234):
+    """
+    Play a few games in-process and check every sample against the rules.
+
+    Legal masks must match is_valid_move, each position must follow from
+    the previous one and outcomes must agree with the final result.
+    Raises AssertionError on the first mismatch.
+
+    Args:
+        games (int): Number of games
+        seed (int): Base random seed
+
+    Returns:
+        int: Number of samples checked
+    """
+    from rules import MegaTicTacToe
+
+    checked = 0
+    for index in range(games):
+        samples = play_game(index, seed, time_ms=5)
+        game = MegaTicTacToe()
+        count = len(samples['outcome'])
+        for row in range(count):
+            marks = [' XO'[code] for code in samples['cells'][row]]
+            assert [marks[base:base + 9] for base in range(0, 81, 9)] == game.grids, \
+                f"game {index} sample {row}: cells differ"
+            legal = [divmod(int(square), 9) for square in np.flatnonzero(samples['legal'][row])]
+            assert legal == [(g, p) for g in range(9) for p in range(9) if game.is_valid_move(g, p)], \
+                f"game {index} sample {row}: legal moves differ"
+            assert samples['player'][row] == (1 if game.current_player == 'X' else 2), \
+                f"game {index} sample {row}: player differs"
+            if row + 1 < count:
+                played = np.flatnonzero(samples['cells'][row + 1] != samples['cells'][row])
+                assert len(played) == 1, f"game {index} sample {row}: next position is not one move on"
+                game.push_move(*divmod(int(played[0]), 9))
+        # The last sample's move is the only one not visible in the samples
+        last = [divmod(int(square), 9) for square in np.flatnonzero(samples['legal'][-1])]
+        assert any(_finishes(game, move, samples) for move in last), \
+            f"game {index}: outcome labels do not match any final move"
+        checked += count
+    return checked
+
+
+def _finishes(game, move, samples):
+    """Return True if move ends the game with the result the samples record."""
+    game.push_move(*move)
+    try:
+        if not game.game_over:
+            return False
+        player = samples['player'][-1]
+        expected = 0 if game.winner == 'Draw' else (1 if game.winner == ' XO'[player] else -1)
+        return bool((samples['outcome'] == np.where(samples['player'] == player,
+                                                    expected, -expected)).all())
+    finally:
+        game.pop_move()
+
+
+def main():
+    """Generate self-play shards and report throughput."""
+    parser = argparse.ArgumentParser(description="MEGA TIC TAC TOE self-play data generator")
+    parser.add_argument('out', nargs='?', default='selfplay-data', help='output directory')
+    parser.add_argument('--games', type=int, default=1000, help='total games in the run')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='worker processes')
+    parser.add_argument('--seed', type=int, default=1234, help='base random seed')
+    parser.add_argument('--time-ms', type=float, default=DEFAULT_TIME_MS,
+                        help='engine search time per move')
+    parser.add_argument('--random-plies', type=int, default=RANDOM_PLIES,
+                        help='random opening moves per game')
+    parser.add_argument('--shard-size', type=int, default=50000, help='samples per shard')
+    parser.add_argument('--queue-size', type=int, help='finished games allowed to wait for the writer')
+    parser.add_argument('--check', type=int, default=0, metavar='GAMES',
+                        help='validate samples of this many games against the rules first')
+    args = parser.parse_args()
+
+    if args.check:
+        print(f"✅ {check(args.check, args.seed)} samples match the rules")
+
+    print(f"🤖 Self-play: {args.games:,} games, {args.workers} workers, "
+          f"{args.time_ms:g} ms per move -> {args.out}")
+    try:
+        played, samples, elapsed = generate(args.out, args.games, args.workers, args.seed,
+                                            args.time_ms, args.random_plies, args.shard_size,
+                                            args.queue_size)
+    except KeyboardInterrupt:
+        print("\n👋 Interrupted; finished games are saved, run again to resume")
+        return
+    if played:
+        print(f"✅ {played:,} games, {samples:,} samples in {elapsed:.1f}s: "
+              f"{samples / elapsed:,.0f} samples/sec ({samples / elapsed / args.workers:,.0f} per worker)")
+    else:
+        print("✅ Nothing to do: every game is already recorded")
+
+
+if __name__ == "__main__":
+    main()
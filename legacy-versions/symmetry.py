@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Symmetry canonicalisation for MEGA TIC TAC TOE positions.
+The 8 symmetries of the square act on both the grid layout and the cells
+inside every grid, so each position has up to 8 equivalent orientations.
+Precomputed permutation tables map all of them to one canonical key.
+"""
+
+from bitboard import BitboardMegaTicTacToe
+from zobrist import full_hash
+
+
+def _rotate(pos):
+    """Rotate a 3x3 position 90 degrees clockwise."""
+    row, col = divmod(pos, 3)
+    return col * 3 + (2 - row)
+
+
+def _mirror(pos):
+    """Mirror a 3x3 position left to right."""
+    row, col = divmod(pos, 3)
+    return row * 3 + (2 - col)
+
+
+def _build_perms():
+    """Return the 8 position permutations: 4 rotations, each optionally mirrored."""
+    perms = []
+    for mirrored in (False, True):
+        perm = [_mirror(pos) if mirrored else pos for pos in range(9)]
+        for _ in range(4):
+            perms.append(tuple(perm))
+            perm = [_rotate(pos) for pos in perm]
+    return tuple(perms)
+
+
+# PERMS[s][pos] is where position pos lands under symmetry s (PERMS[0] is identity)
+PERMS = _build_perms()
+
+# INVERSE[s] is the symmetry that undoes s
+INVERSE = tuple(next(t for t in range(8) if all(PERMS[t][PERMS[s][pos]] == pos for pos in range(9)))
+                for s in range(8))
+
+# MASK_PERMS[s][mask] is a 9-bit mask with every position moved by symmetry s
+MASK_PERMS = tuple(
+    tuple(sum(1 << perm[pos] for pos in range(9) if mask >> pos & 1) for mask in range(512))
+    for perm in PERMS
+)
+
+# SQUARE_PERMS[s][grid * 9 + position] applies s to both the grid and the position
+SQUARE_PERMS = tuple(
+    tuple(perm[square // 9] * 9 + perm[square % 9] for square in range(81))
+    for perm in PERMS
+)
+
+# Position keys (see _position_key) fit in 167 bits: cells, active grid, side to move
+KEY_BYTES = 21
+
+
+def _transform_cells(masks, symmetry):
+    """Apply a symmetry to per-grid 9-bit masks, returning packed 81-bit cells."""
+    perm = PERMS[symmetry]
+    mask_perm = MASK_PERMS[symmetry]
+    result = 0
+    for grid_num, mask in enumerate(masks):
+        if mask:
+            result |= mask_perm[mask] << (perm[grid_num] * 9)
+    return result
+
+
+def transform(state, symmetry):
+    """
+    Return a new bitboard state with a symmetry applied.
+
+    Args:
+        state (BitboardMegaTicTacToe): The position to transform
+        symmetry (int): Symmetry index 0-7
+
+    Returns:
+        BitboardMegaTicTacToe: The transformed position (no move history)
+    """
+    result = BitboardMegaTicTacToe()
+    result.set_cells(_transform_cells(state.x_masks, symmetry),
+                     _transform_cells(state.o_masks, symmetry))
+    result.current_player = state.current_player
+    result.game_over = state.game_over
+    result.winner = state.winner
+    result.active_grid = None if state.active_grid is None else PERMS[symmetry][state.active_grid]
+    result.first_move = state.first_move
+    result.zobrist_key = full_hash(result)
+    return result
+
+
+def transform_move(move, symmetry):
+    """
+    Map a (grid_num, position) move through a symmetry.
+
+    Args:
+        move (tuple): (grid_num, position)
+        symmetry (int): Symmetry index 0-7
+
+    Returns:
+        tuple: The transformed (grid_num, position)
+    """
+    perm = PERMS[symmetry]
+    return (perm[move[0]], perm[move[1]])
+
+
+def _position_key(x_cells, o_cells, active_grid, current_player):
+    """Pack the deciding parts of a position into one integer."""
+    # Grid results follow from the cells, so they are not part of the key
+    active = 9 if active_grid is None else active_grid
+    return (x_cells | o_cells << 81 | active << 162
+            | (1 if current_player == 'O' else 0) << 166)
+
+
+def canonicalize(state):
+    """
+    Find the canonical orientation of a position.
+
+    Args:
+        state (MegaTicTacToe): Any MegaTicTacToe-compatible game state
+
+    Returns:
+        tuple: (canonical key, symmetry) where applying `symmetry` to the
+            state gives the canonical orientation; map moves back with
+            transform_move(move, INVERSE[symmetry])
+    """
+    if not isinstance(state, BitboardMegaTicTacToe):
+        state = BitboardMegaTicTacToe.from_game(state)
+    best_key = None
+    best_symmetry = 0
+    for symmetry in range(8):
+        active = state.active_grid
+        key = _position_key(_transform_cells(state.x_masks, symmetry),
+                            _transform_cells(state.o_masks, symmetry),
+                            None if active is None else PERMS[symmetry][active],
+                            state.current_player)
+        if best_key is None or key < best_key:
+            best_key = key
+            best_symmetry = symmetry
+    return best_key, best_symmetry
+
+
+def state_from_key(key):
+    """
+    Rebuild a bitboard state from a canonical (or any) position key.
+
+    Args:
+        key (int): Key produced by canonicalize
+
+    Returns:
+        BitboardMegaTicTacToe: The position, with grid results recomputed
+    """
+    state = BitboardMegaTicTacToe()
+    all_cells = (1 << 81) - 1
+    state.set_cells(key & all_cells, key >> 81 & all_cells)
+    active = key >> 162 & 0xF
+    state.active_grid = None if active == 9 else active
+    state.current_player = 'O' if key >> 166 & 1 else 'X'
+    state.first_move = not key & ((1 << 162) - 1)
+    state.winner = state.check_winner()
+    state.game_over = state.winner is not None
+    state.zobrist_key = full_hash(state)
+    return state
+
+
+def symmetries_of(state):
+    """
+    Count the distinct orientations of a position.
+
+    Args:
+        state (BitboardMegaTicTacToe): The position
+
+    Returns:
+        int: 1-8; storage saved by canonicalisation for this position
+    """
+    keys = set()
+    for symmetry in range(8):
+        oriented = transform(state, symmetry)
+        keys.add(_position_key(oriented.x_cells, oriented.o_cells,
+                               oriented.active_grid, oriented.current_player))
+    return len(keys)
+
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Precomputed lookup tables for MEGA TIC TAC TOE.
+Every 3x3 pattern (a sub-grid or the mega board itself) is a 9-bit mask,
+so win detection and move generation become single table lookups.
+"""
+
+# All possible winning combinations of a 3x3 grid
+WINNING_COMBINATIONS = (
+    # Rows
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    # Columns
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    # Diagonals
+    (0, 4, 8), (2, 4, 6),
+)
+
+# The same lines as 9-bit masks (bit n = position n)
+LINE_MASKS = tuple(sum(1 << pos for pos in combo) for combo in WINNING_COMBINATIONS)
+
+FULL_GRID = 0x1FF  # All 9 positions of a grid occupied
+
+
+def _build_win_table():
+    """Return a 512-entry table: 1 if the 9-bit mask contains a line."""
+    return bytes(int(any(mask & line == line for line in LINE_MASKS)) for mask in range(512))
+
+
+def _build_expand_table():
+    """Return a 512-entry table mapping a 9-bit grid mask to its 81-bit cell mask."""
+    table = []
+    for mask in range(512):
+        cells = 0
+        for grid_num in range(9):
+            if mask >> grid_num & 1:
+                cells |= FULL_GRID << (grid_num * 9)
+        table.append(cells)
+    return tuple(table)
+
+
+# WIN_TABLE[mask] is 1 when one player's marks in mask complete a line
+WIN_TABLE = _build_win_table()
+
+# EXPAND_TABLE[grids] selects every square of the grids set in a 9-bit mask
+EXPAND_TABLE = _build_expand_table()
+
+
+def outcome(x_mask, o_mask, drawn_mask=0):
+    """
+    Resolve a 3x3 pattern with one lookup per player.
+
+    Used for sub-grids (x/o are marked positions) and for the mega board
+    (x/o are won grids, drawn_mask the drawn grids).
+
+    Args:
+        x_mask (int): 9-bit mask owned by X
+        o_mask (int): 9-bit mask owned by O
+        drawn_mask (int): 9-bit mask of cells that count as filled for nobody
+
+    Returns:
+        str: 'X', 'O', 'Draw', or None
+    """
+    if WIN_TABLE[x_mask]:
+        return 'X'
+    if WIN_TABLE[o_mask]:
+        return 'O'
+    if x_mask | o_mask | drawn_mask == FULL_GRID:
+        return 'Draw'
+    return None
@@ -0,0 +1,20 @@
+"""
+Tests for the NumPy batch simulator (run with `python -m pytest -q`).
+"""
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from batch import BatchMegaTicTacToe, cross_validate  # noqa: E402
+
+
+def test_batch_matches_single_games():
+    """Every step of a random batch matches the original string-scanning rules."""
+    assert cross_validate(games=20, seed=1234) > 0
+
+
+def test_batch_starts_with_every_square_legal():
+    """A new batch offers all 81 squares in every game."""
+    batch = BatchMegaTicTacToe(4)
+    assert batch.legal_moves_mask().sum() == 4 * 81
@@ -0,0 +1,92 @@
+"""
+Tests for the opening book and endgame solver (run with `python -m pytest -q`).
+"""
+
+import random
+import time
+
+import pytest
+
+from bitboard import BitboardMegaTicTacToe
+from book import EndgameSolver, OpeningBook, choose_move, generate_book, playable_squares
+from engine import SearchTimeout
+from symmetry import canonicalize, symmetries_of, transform, transform_move
+
+
+def late_position(seed, empties):
+    """Play random moves until at most `empties` playable squares are left."""
+    rng = random.Random(seed)
+    while True:
+        game = BitboardMegaTicTacToe()
+        while not game.game_over and playable_squares(game) > empties:
+            game.push_move(*rng.choice(game.legal_moves()))
+        if not game.game_over:
+            return game
+
+
+def negamax(state):
+    """Plain exact value for the side to move: 1 win, 0 draw, -1 loss."""
+    if state.game_over:
+        return 0 if state.winner == 'Draw' else -1
+    value = -1
+    for move in state.legal_moves():
+        state.push_move(*move)
+        value = max(value, -negamax(state))
+        state.pop_move()
+    return value
+
+
+def after_move(state, move):
+    """Return a copy of state with move played."""
+    state = BitboardMegaTicTacToe.from_game(state)
+    state.push_move(*move)
+    return state
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_solver_matches_negamax(seed):
+    """The memoised solver agrees with a plain negamax, and its move keeps the value."""
+    game = late_position(seed, 7)
+    value, move = EndgameSolver().solve(game)
+    assert value == negamax(game)
+    game.push_move(*move)
+    assert -negamax(game) == value
+
+
+def test_timed_out_solve_falls_back_to_search():
+    """A solve that runs out of time raises; choose_move still answers in budget."""
+    game = late_position(3, 30)
+    solver = EndgameSolver(max_empties=81)
+    with pytest.raises(SearchTimeout):
+        solver.solve(game, time_ms=0)
+    start = time.perf_counter()
+    move = choose_move(game, 30, solver=solver)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert move in game.legal_moves()
+    assert elapsed_ms < 80
+
+
+def test_book_lookup_in_every_orientation(tmp_path):
+    """A booked move comes back legal and correctly mapped for all 8 symmetries."""
+    path = str(tmp_path / 'book.nbk')
+    generate_book(path, depth=2, time_ms=5)
+    book = OpeningBook(path)
+    try:
+        for first in [None, (0, 1), (4, 4), (2, 5)]:
+            game = BitboardMegaTicTacToe()
+            if first is not None:
+                game.push_move(*first)
+            move = book.lookup(game)
+            assert move in game.legal_moves()
+            after = canonicalize(after_move(game, move))[0]
+            for symmetry in range(8):
+                oriented = transform(game, symmetry)
+                oriented_move = book.lookup(oriented)
+                assert oriented_move in oriented.legal_moves()
+                if symmetries_of(game) == 8:
+                    assert oriented_move == transform_move(move, symmetry)
+                else:
+                    # Symmetric positions have several equivalent moves to give back
+                    assert canonicalize(after_move(oriented, oriented_move))[0] == after
+    finally:
+        book.close()
@@ -0,0 +1,68 @@
+"""
+Tests for the alpha-beta engine (run with `python -m pytest -q`).
+"""
+
+import random
+import time
+from types import SimpleNamespace
+
+from bitboard import BitboardMegaTicTacToe
+from engine import MAX_DEPTH, Search, best_move, warm_up
+from positiondb import PositionDB
+from rules import MegaTicTacToe
+from zobrist import TranspositionTable
+
+
+def winning_position():
+    """X has won grids 0 and 1 and must play in grid 2, where (2, 2) completes both lines."""
+    open_grid = [' '] * 9
+    layout = SimpleNamespace(
+        grids=[['X', 'X', 'X', 'O', 'O', ' ', ' ', ' ', ' '],
+               ['X', 'X', 'X', 'O', ' ', 'O', ' ', ' ', ' '],
+               ['X', 'X', ' ', 'O', 'O', ' ', ' ', ' ', ' ']] + [open_grid] * 6,
+        grid_winners=['X', 'X'] + [None] * 7, current_player='X', game_over=False,
+        winner=None, active_grid=2, first_move=False)
+    return BitboardMegaTicTacToe.from_game(layout)
+
+
+def test_finds_immediate_win():
+    """A one-move win of the whole game is chosen."""
+    assert best_move(winning_position(), 50, table=TranspositionTable(1 << 16)) == (2, 2)
+
+
+def test_answers_within_budget():
+    """A search from a busy middlegame returns close to its time budget."""
+    warm_up()
+    game = BitboardMegaTicTacToe()
+    rng = random.Random(5)
+    for _ in range(20):
+        game.push_move(*rng.choice(game.legal_moves()))
+    start = time.perf_counter()
+    move = best_move(game, 30)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert move in game.legal_moves()
+    assert elapsed_ms < 30 + 50
+
+
+def test_leaves_state_untouched():
+    """The caller's game, its history and Zobrist key are unchanged by a search."""
+    rng = random.Random(9)
+    for game in (MegaTicTacToe(), BitboardMegaTicTacToe()):
+        for _ in range(12):
+            game.push_move(*rng.choice(game.legal_moves()))
+        before = (game.grids, game.grid_winners, game.current_player, game.active_grid,
+                  list(game.move_stack), getattr(game, 'zobrist_key', None))
+        best_move(game, 20)
+        assert before == (game.grids, game.grid_winners, game.current_player, game.active_grid,
+                          list(game.move_stack), getattr(game, 'zobrist_key', None))
+
+
+def test_reuses_index_rows_deeper_than_the_timed_search():
+    """A stored move deeper than the search can reach answers even below max_depth."""
+    game = BitboardMegaTicTacToe()
+    game.push_move(4, 4)
+    db = PositionDB()
+    db.store(game, 7, (4, 8), visits=0, depth=40)
+    search = Search(game, 10, table=TranspositionTable(1 << 16), db=db)
+    assert search.run(MAX_DEPTH) == (4, 8)
+    assert search.from_db and search.depth_reached == 40
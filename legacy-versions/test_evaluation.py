@@ -0,0 +1,34 @@
+"""
+Tests for the static evaluation (run with `python -m pytest -q`).
+"""
+
+import json
+
+import pytest
+
+from evaluation import DEFAULT_WEIGHTS, check, load_weights
+
+
+def test_single_batch_and_reference_features_agree():
+    """Table, batch and reference features and scores match on random positions."""
+    pytest.importorskip('numpy')
+    assert check(500) == 500
+
+
+@pytest.mark.parametrize('weights', [{'no_such_feature': 1}, {'grids_won': 'high'},
+                                     {'grids_won': True}, [1, 2, 3]])
+def test_load_weights_rejects_bad_files(tmp_path, weights):
+    """Unknown features, non-numeric weights and non-objects raise ValueError."""
+    path = tmp_path / 'weights.json'
+    path.write_text(json.dumps(weights))
+    with pytest.raises(ValueError):
+        load_weights(str(path))
+
+
+def test_load_weights_fills_missing_features(tmp_path):
+    """Features left out of the file keep their default weight."""
+    path = tmp_path / 'weights.json'
+    path.write_text(json.dumps({'grids_won': 7.6}))
+    weights = load_weights(str(path))
+    assert weights['grids_won'] == 8
+    assert weights['free_choice'] == DEFAULT_WEIGHTS['free_choice']
@@ -0,0 +1,141 @@
+"""
+Tests for the asyncio game server (run with `python -m pytest -q`).
+"""
+
+import asyncio
+
+from game_server import MAX_BODY_BYTES, GameClient, GameRegistry, GameServer
+
+
+def run_against_server(scenario, server=None):
+    """
+    Start a server on a free port and run `scenario(server, client)` on it.
+
+    Returns:
+        The scenario's return value
+    """
+    async def run():
+        host = '127.0.0.1'
+        running = server or GameServer()
+        port = await running.start(host, 0)
+        client = GameClient(host, port)
+        await client.connect()
+        try:
+            return await scenario(running, client)
+        finally:
+            await client.close()
+            await running.stop()
+    return asyncio.run(run())
+
+
+async def raw_status(client, request):
+    """Send raw request bytes, read the whole response and return its status code."""
+    client.writer.write(request)
+    head = await client.reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    for line in lines[1:]:
+        if line.lower().startswith('content-length:'):
+            await client.reader.readexactly(int(line.split(':', 1)[1]))
+    return int(lines[0].split(' ', 2)[1])
+
+
+def test_create_and_move():
+    """A created game accepts a legal move and reports it back."""
+    async def scenario(server, client):
+        created = await client.create_game()
+        status, state = await client.move(created['code'], 4, 4)
+        return created, status, state, await client.get_game(created['code'])
+
+    created, status, state, (get_status, fetched) = run_against_server(scenario)
+    assert created['move_count'] == 0 and created['current_player'] == 'X'
+    assert status == 200
+    assert state['grids'][4][4] == 'X' and state['active_grid'] == 4
+    assert get_status == 200 and fetched == state
+
+
+def test_unknown_game_and_path_are_404():
+    """Unknown codes and paths answer 404."""
+    async def scenario(server, client):
+        return [(await client.get_game('ZZZZ'))[0],
+                (await client.move('ZZZZ', 0, 0))[0],
+                (await client.request('GET', '/nowhere'))[0]]
+
+    assert run_against_server(scenario) == [404, 404, 404]
+
+
+def test_illegal_move_is_409():
+    """Moves outside the active grid or onto a taken square answer 409."""
+    async def scenario(server, client):
+        code = (await client.create_game())['code']
+        await client.move(code, 4, 4)
+        return [(await client.move(code, 0, 0))[0], (await client.move(code, 4, 4))[0]]
+
+    assert run_against_server(scenario) == [409, 409]
+
+
+def test_malformed_move_is_400():
+    """Non-integer, boolean, huge or missing grid/position values answer 400."""
+    bodies = [b'{"grid": "4", "position": 4}', b'{"grid": 4.0, "position": 4}',
+              b'{"grid": 1e400, "position": 4}', b'{"grid": true, "position": 4}',
+              b'{"grid": 4}', b'not json']
+
+    async def scenario(server, client):
+        code = (await client.create_game())['code']
+        statuses = []
+        for body in bodies:
+            statuses.append(await raw_status(
+                client, f"POST /games/{code}/moves HTTP/1.1\r\n"
+                        f"Content-Length: {len(body)}\r\n\r\n".encode() + body))
+        return statuses
+
+    assert run_against_server(scenario) == [400] * len(bodies)
+
+
+def test_bad_content_length_is_400():
+    """A Content-Length that is not a plain integer answers 400."""
+    async def scenario(server, client):
+        return await raw_status(client, b"POST /games HTTP/1.1\r\nContent-Length: -1\r\n\r\n")
+
+    assert run_against_server(scenario) == 400
+
+
+def test_oversized_body_is_413():
+    """Bodies over MAX_BODY_BYTES answer 413 without being read."""
+    async def scenario(server, client):
+        code = (await client.create_game())['code']
+        return (await client.request('POST', f'/games/{code}/moves',
+                                     {'grid': 4, 'position': 4, 'pad': 'x' * MAX_BODY_BYTES}))[0]
+
+    assert run_against_server(scenario) == 413
+
+
+def test_routing_error_is_500(capsys):
+    """An exception while routing answers 500 instead of dropping the connection."""
+    server = GameServer()
+
+    async def broken(code, grid_num, position):
+        raise RuntimeError('boom')
+    server.registry.play = broken
+
+    async def scenario(server, client):
+        code = (await client.create_game())['code']
+        return (await client.move(code, 4, 4))[0], (await client.get_game(code))[0]
+
+    assert run_against_server(scenario, server) == (500, 200)
+    assert 'RuntimeError: boom' in capsys.readouterr().err
+
+
+def test_evict_idle():
+    """With no idle allowance every unlocked game is evicted."""
+    async def scenario():
+        registry = GameRegistry(idle_seconds=0)
+        for _ in range(3):
+            registry.create()
+        locked = registry.create()
+        async with locked.lock:
+            evicted = registry.evict_idle()
+        return evicted, list(registry.sessions), locked.code, registry.evicted
+
+    evicted, remaining, locked_code, total = asyncio.run(scenario())
+    assert evicted == 3 and total == 3
+    assert remaining == [locked_code]
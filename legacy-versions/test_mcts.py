@@ -0,0 +1,35 @@
+"""
+Tests for the MCTS engine (run with `python -m pytest -q`).
+"""
+
+from bitboard import BitboardMegaTicTacToe
+from mcts import best_move, search
+
+
+def test_seeded_search_is_deterministic():
+    """Two seeded single-worker searches give the same visits, total and score."""
+    first = search(BitboardMegaTicTacToe(), 300, workers=1, seed=1)
+    second = search(BitboardMegaTicTacToe(), 300, workers=1, seed=1)
+    assert first == second
+    assert sum(first[0].values()) == first[1] == 300
+
+
+def test_seeded_best_move_is_reproducible():
+    """best_move with a seed picks the same legal move every time."""
+    game = BitboardMegaTicTacToe()
+    for move in [(4, 4), (4, 0), (0, 8)]:
+        game.push_move(*move)
+    moves = {best_move(game, 200, seed=7) for _ in range(3)}
+    assert len(moves) == 1
+    assert moves.pop() in game.legal_moves()
+
+
+def test_seeded_parallel_search_is_deterministic():
+    """Two seeded two-worker searches agree, and the merged visits cover every playout."""
+    first = search(BitboardMegaTicTacToe(), 300, workers=2, seed=1)
+    second = search(BitboardMegaTicTacToe(), 300, workers=2, seed=1)
+    assert first == second
+    visits, total, _ = first
+    assert total == 300 and sum(visits.values()) == 300
+    assert best_move(BitboardMegaTicTacToe(), 300, workers=2, seed=1) == max(
+        sorted(visits), key=visits.get)
@@ -0,0 +1,34 @@
+"""
+Tests for the game record format (run with `python -m pytest -q`).
+"""
+
+import pytest
+
+from records import RecordError, decode_game, encode_game
+
+
+def test_round_trip():
+    """A decoded record gives back the encoded moves and result."""
+    moves = [(4, 4), (4, 0), (0, 8)]
+    record = encode_game(moves, 'X')
+    assert decode_game(record) == (moves, 'X', len(record))
+
+
+@pytest.mark.parametrize('square', [81, 200, 255])
+def test_move_byte_off_the_board_is_rejected(square):
+    """Move bytes past the last square raise instead of decoding to grid 9+."""
+    with pytest.raises(RecordError):
+        decode_game(bytes([2, 0, 40, square]))
+
+
+@pytest.mark.parametrize('move', [(0, 9), (9, 0), (-1, 0), (0, -1)])
+def test_move_off_the_board_is_not_encoded(move):
+    """Grids and positions outside 0-8 raise instead of encoding another square."""
+    with pytest.raises(RecordError):
+        encode_game([(4, 4), move])
+
+
+def test_unknown_result_is_not_encoded():
+    """Results other than 'X', 'O', 'Draw' and None raise RecordError."""
+    with pytest.raises(RecordError):
+        encode_game([(4, 4)], 'x')
@@ -0,0 +1,122 @@
+"""
+Tests for the game state classes (run with `python -m pytest -q`).
+"""
+
+import random
+
+import pytest
+
+from bitboard import BitboardMegaTicTacToe
+from compact import CompactMegaTicTacToe, cross_validate, live_game_bytes
+from rules import MegaTicTacToe
+from symmetry import INVERSE, canonicalize, state_from_key, transform, transform_move
+from tables import WINNING_COMBINATIONS
+from zobrist import full_hash
+
+STATE_CLASSES = (MegaTicTacToe, BitboardMegaTicTacToe, CompactMegaTicTacToe)
+
+
+def random_positions(count, seed=1234):
+    """Yield bitboard positions part way through random games."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        game = BitboardMegaTicTacToe()
+        for _ in range(rng.randrange(70)):
+            if game.game_over:
+                break
+            game.push_move(*rng.choice(game.legal_moves()))
+        yield game
+
+
+def line_result(marks, open_marks):
+    """Resolve a 3x3 pattern by scanning lines, as a reference for the tables."""
+    for a, b, c in WINNING_COMBINATIONS:
+        if marks[a] == marks[b] == marks[c] and marks[a] not in open_marks:
+            return marks[a]
+    return None
+
+
+def test_compact_matches_list_game():
+    """Compact state, copy() and pickle agree with MegaTicTacToe move by move."""
+    assert cross_validate(games=20, seed=1234) > 0
+
+
+def test_compact_game_uses_less_memory():
+    """A live compact game holds less heap than a list-based one."""
+    compact = live_game_bytes(CompactMegaTicTacToe, 50, 1234)
+    assert compact < live_game_bytes(MegaTicTacToe, 50, 1234)
+
+
+@pytest.mark.parametrize('game_class', STATE_CLASSES)
+def test_wins_match_line_scan(game_class):
+    """Table lookups give the same grid and game results as scanning lines."""
+    rng = random.Random(7)
+    for _ in range(20):
+        game = game_class()
+        while not game.game_over:
+            for grid_num, marks in enumerate(game.grids):
+                expected = line_result(marks, ' ') or (None if ' ' in marks else 'Draw')
+                assert game.check_grid_winner(grid_num) == expected
+            winners = game.grid_winners
+            expected = line_result(winners, (None, 'Draw')) or (None if None in winners else 'Draw')
+            assert game.check_winner() == expected
+            game.push_move(*rng.choice(game.legal_moves()))
+
+
+@pytest.mark.parametrize('game_class', STATE_CLASSES)
+def test_legal_moves_match_is_valid_move(game_class):
+    """legal_moves() lists exactly the squares is_valid_move accepts."""
+    for position in random_positions(50):
+        game = game_class.from_game(position)
+        expected = [(g, p) for g in range(9) for p in range(9) if game.is_valid_move(g, p)]
+        assert game.legal_moves() == expected
+
+
+@pytest.mark.parametrize('game_class', STATE_CLASSES)
+def test_pop_move_unwinds_to_new_game(game_class):
+    """pop_move undoes every push_move back to the starting position."""
+    rng = random.Random(3)
+    fresh = game_class()
+    for _ in range(10):
+        game = game_class()
+        while not game.game_over:
+            game.push_move(*rng.choice(game.legal_moves()))
+        assert game.move_count == len(game.move_stack)
+        while game.pop_move():
+            pass
+        assert game.move_count == 0
+        assert game.grids == fresh.grids
+        assert game.grid_winners == fresh.grid_winners
+        assert game.legal_moves() == fresh.legal_moves()
+        assert (game.current_player, game.active_grid, game.first_move,
+                game.game_over, game.winner) == ('X', None, True, False, None)
+
+
+def test_incremental_zobrist_key_matches_full_hash():
+    """The key kept up to date by push_move/pop_move equals a fresh hash."""
+    rng = random.Random(11)
+    for _ in range(10):
+        game = BitboardMegaTicTacToe()
+        keys = []
+        while not game.game_over:
+            keys.append(game.zobrist_key)
+            game.push_move(*rng.choice(game.legal_moves()))
+            assert game.zobrist_key == full_hash(game)
+        while game.pop_move():
+            assert game.zobrist_key == keys.pop() == full_hash(game)
+
+
+def test_symmetry_round_trip():
+    """A canonical key rebuilds the transformed position and moves map back."""
+    for position in random_positions(30, seed=99):
+        key, symmetry = canonicalize(position)
+        canonical = transform(position, symmetry)
+        rebuilt = state_from_key(key)
+        assert rebuilt.grids == canonical.grids
+        assert rebuilt.grid_winners == canonical.grid_winners
+        assert rebuilt.zobrist_key == canonical.zobrist_key
+        assert transform(canonical, INVERSE[symmetry]).grids == position.grids
+        for move in position.legal_moves():
+            assert transform_move(transform_move(move, symmetry), INVERSE[symmetry]) == move
+        assert sorted(transform_move(move, INVERSE[symmetry]) for move in canonical.legal_moves()) \
+            == position.legal_moves()
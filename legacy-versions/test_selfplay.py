@@ -0,0 +1,39 @@
+"""
+Tests for the self-play pipeline (run with `python -m pytest -q`).
+"""
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from selfplay import check, generate, load_shards  # noqa: E402
+
+
+def test_samples_match_the_rules():
+    """Sampled cells, legal masks, players and outcomes follow the rules."""
+    assert check(games=2) > 0
+
+
+def test_generate_and_resume(tmp_path):
+    """A resumed run plays only the missing games and keeps the earlier shards."""
+    directory = str(tmp_path / 'run')
+    played, samples, _ = generate(directory, 2, workers=2, time_ms=2, shard_size=50, report=None)
+    assert played == 2 and samples > 0
+    first = load_shards(directory)
+
+    played, more, _ = generate(directory, 3, workers=2, time_ms=2, shard_size=50, report=None)
+    assert played == 1 and more > 0
+    data = load_shards(directory)
+    assert len(data['outcome']) == samples + more
+    assert sorted(set(data['game'].tolist())) == [0, 1, 2]
+    assert (data['cells'][:samples] == first['cells']).all()
+
+    assert generate(directory, 3, workers=2, time_ms=2, report=None) == (0, 0, 0.0)
+
+
+def test_resume_with_other_settings_is_refused(tmp_path):
+    """Resuming into a run made with a different seed exits instead of mixing data."""
+    directory = str(tmp_path / 'run')
+    generate(directory, 1, workers=1, time_ms=2, report=None)
+    with pytest.raises(SystemExit):
+        generate(directory, 2, workers=1, seed=99, time_ms=2, report=None)
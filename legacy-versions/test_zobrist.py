@@ -0,0 +1,44 @@
+"""
+Tests for the transposition table (run with `python -m pytest -q`).
+"""
+
+from zobrist import ENTRY_BYTES, EXACT, LOWER, TranspositionTable
+
+
+def small_table():
+    """A table with two buckets of two slots; even keys share bucket 0."""
+    table = TranspositionTable(4 * ENTRY_BYTES)
+    assert table.size == 4
+    return table
+
+
+def test_probe_returns_stored_entry():
+    """A stored result comes back unchanged, including negative scores."""
+    table = small_table()
+    table.store(2, -1234, 7, LOWER, 40)
+    assert table.probe(2) == (-1234, 7, LOWER, 40)
+    assert table.probe(4) is None
+
+
+def test_deeper_result_takes_first_slot():
+    """The first slot keeps the deepest result; shallower ones go to the second."""
+    table = small_table()
+    table.store(2, 10, 5, EXACT)
+    table.store(4, 20, 3, EXACT)
+    assert list(table.keys) == [2, 4, 0, 0]
+    table.store(6, 30, 8, EXACT)
+    assert list(table.keys) == [6, 4, 0, 0]
+    assert table.stats()['used'] == 2 and table.stats()['overwrites'] == 1
+
+
+def test_key_in_second_slot_is_updated_in_place():
+    """Restoring a key held in the second slot never duplicates it or evicts the first."""
+    table = small_table()
+    table.store(2, 10, 5, EXACT)
+    table.store(4, 20, 3, EXACT)
+    table.store(4, 25, 6, EXACT)
+    assert list(table.keys) == [2, 4, 0, 0]
+    assert table.probe(2) == (10, 5, EXACT, None)
+    assert table.probe(4) == (25, 6, EXACT, None)
+    stats = table.stats()
+    assert stats['used'] == 2 and stats['overwrites'] == 0
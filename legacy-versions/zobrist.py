@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Zobrist hashing and a bounded transposition table for MEGA TIC TAC TOE.
+Positions are identified by a 64-bit key covering the 81 cells, the grid
+results, the active grid and the side to move.
+"""
+
+import random
+from array import array
+
+ZOBRIST_SEED = 0x9E3779B9  # Fixed so keys (and stored tables) are reproducible
+
+_rng = random.Random(ZOBRIST_SEED)
+
+# CELL_KEYS[player][square], player 0 = X, 1 = O, square = grid * 9 + position
+CELL_KEYS = tuple(tuple(_rng.getrandbits(64) for _ in range(81)) for _ in range(2))
+# GRID_KEYS[result][grid_num], result 0 = X won, 1 = O won, 2 = drawn
+GRID_KEYS = tuple(tuple(_rng.getrandbits(64) for _ in range(9)) for _ in range(3))
+# ACTIVE_KEYS[grid_num] for grids 0-8, ACTIVE_KEYS[9] when any grid may be played
+ACTIVE_KEYS = tuple(_rng.getrandbits(64) for _ in range(10))
+SIDE_KEY = _rng.getrandbits(64)  # Mixed in when O is to move
+
+del _rng
+
+# Bound types stored with each table entry
+EXACT = 0
+LOWER = 1  # Score is at least the stored value (beta cutoff)
+UPPER = 2  # Score is at most the stored value (failed low)
+
+NO_MOVE = 127  # Stored move square when there is no best move
+ENTRY_BYTES = 16  # One 64-bit key plus one 64-bit packed entry
+DEFAULT_TABLE_BYTES = 16 * 1024 * 1024
+_SCORE_OFFSET = 1 << 24  # Keeps packed scores non-negative
+
+
+def active_key(active_grid):
+    """Return the key for an active grid (None meaning any grid)."""
+    return ACTIVE_KEYS[9 if active_grid is None else active_grid]
+
+
+def full_hash(state):
+    """
+    Compute the Zobrist key of a bitboard state from scratch.
+
+    Args:
+        state (BitboardMegaTicTacToe): The position to hash
+
+    Returns:
+        int: 64-bit position key
+    """
+    key = active_key(state.active_grid)
+    if state.current_player == 'O':
+        key ^= SIDE_KEY
+    for player, cells in enumerate((state.x_cells, state.o_cells)):
+        while cells:
+            low = cells & -cells
+            key ^= CELL_KEYS[player][low.bit_length() - 1]
+            cells ^= low
+    for result, grids in enumerate((state.x_grids, state.o_grids, state.drawn_grids)):
+        for grid_num in range(9):
+            if grids >> grid_num & 1:
+                key ^= GRID_KEYS[result][grid_num]
+    return key
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results.
+
+    Entries live in two flat 64-bit arrays sized from a memory cap, grouped
+    into buckets of two slots: the first slot keeps the deepest result seen
+    (depth-preferred), the second is always replaced. Hit-rate and memory
+    counters are exposed for tuning the table size.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_TABLE_BYTES):
+        """
+        Allocate the table.
+
+        Args:
+            max_bytes (int): Memory cap; rounded down to a power-of-two
+                number of buckets
+        """
+        buckets = 1
+        while buckets * 4 * ENTRY_BYTES <= max_bytes:
+            buckets *= 2
+        self.bucket_mask = buckets - 1
+        self.size = buckets * 2
+        self.keys = array('Q', bytes(8 * self.size))
+        self.entries = array('Q', bytes(8 * self.size))
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+        self.used = 0
+
+    def probe(self, key):
+        """
+        Look up a position.
+
+        Args:
+            key (int): Zobrist key of the position
+
+        Returns:
+            tuple: (score, depth, bound, move_square) or None on a miss;
+                move_square is None when no best move was stored
+        """
+        self.probes += 1
+        slot = (key & self.bucket_mask) << 1
+        for index in (slot, slot + 1):
+            if self.keys[index] == key:
+                self.hits += 1
+                packed = self.entries[index]
+                move = packed & 0x7F
+                return ((packed >> 16) - _SCORE_OFFSET, packed >> 9 & 0x7F,
+                        packed >> 7 & 0x3, None if move == NO_MOVE else move)
+        return None
+
+    def store(self, key, score, depth, bound, move_square=None):
+        """
+        Record a search result, applying the replacement policy.
+
+        Args:
+            key (int): Zobrist key of the position
+            score (int): Score from the side to move's point of view
+            depth (int): Remaining depth the score was searched to
+            bound (int): EXACT, LOWER or UPPER
+            move_square (int): Best move as grid * 9 + position, or None
+        """
+        self.stores += 1
+        packed = (((score + _SCORE_OFFSET) << 16) | (depth << 9) | (bound << 7)
+                  | (NO_MOVE if move_square is None else move_square))
+        slot = (key & self.bucket_mask) << 1
+        keys = self.keys
+        if keys[slot] == key:
+            index = slot
+        elif keys[slot + 1] == key:
+            # Update the existing copy so the bucket never holds the key twice
+            index = slot + 1
+        elif depth >= (self.entries[slot] >> 9 & 0x7F) or not keys[slot]:
+            index = slot
+        else:
+            index = slot + 1
+        if not keys[index]:
+            self.used += 1
+        elif keys[index] != key:
+            self.overwrites += 1
+        keys[index] = key
+        self.entries[index] = packed
+
+    def clear(self):
+        """Empty the table and reset its counters."""
+        self.keys = array('Q', bytes(8 * self.size))
+        self.entries = array('Q', bytes(8 * self.size))
+        self.probes = self.hits = self.stores = self.overwrites = self.used = 0
+
+    @property
+    def hit_rate(self):
+        """Fraction of probes that found their position (0.0 when unused)."""
+        return self.hits / self.probes if self.probes else 0.0
+
+    @property
+    def memory_bytes(self):
+        """Bytes held by the key and entry arrays."""
+        return (self.keys.buffer_info()[1] * self.keys.itemsize
+                + self.entries.buffer_info()[1] * self.entries.itemsize)
+
+    def stats(self):
+        """
+        Summarise table usage for tuning.
+
+        Returns:
+            dict: Counters, fill ratio, hit rate and memory use
+        """
+        return {
+            'size': self.size,
+            'used': self.used,
+            'fill': self.used / self.size,
+            'probes': self.probes,
+            'hits': self.hits,
+            'hit_rate': self.hit_rate,
+            'stores': self.stores,
+            'overwrites': self.overwrites,
+            'memory_bytes': self.memory_bytes,
+        }